@@ -1,364 +1,530 @@
-import sqlite3
-import tkinter as tk
-from tkinter import messagebox, ttk
-from dataclasses import dataclass
-from typing import List, Optional
-
-@dataclass
-class Student:
-    first_name: str
-    last_name: str
-    patronymic: str
-    group: str
-    grades: List[int]
-    id: Optional[int] = None
-
-    def average_grade(self) -> float:
-        return sum(self.grades) / len(self.grades) if self.grades else 0.0
-
-
-class StudentDatabase:
-    def __init__(self, db_name: str = "students.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.cursor = self.conn.cursor()
-        self._create_table()
-
-    def _create_table(self):
-        self.cursor.execute("""
-                            CREATE TABLE IF NOT EXISTS students
-                            (
-                                id
-                                INTEGER
-                                PRIMARY
-                                KEY
-                                AUTOINCREMENT,
-                                first_name
-                                TEXT,
-                                last_name
-                                TEXT,
-                                patronymic
-                                TEXT,
-                                group_name
-                                TEXT,
-                                grade1
-                                INTEGER,
-                                grade2
-                                INTEGER,
-                                grade3
-                                INTEGER,
-                                grade4
-                                INTEGER
-                            )
-                            """)
-        self.conn.commit()
-
-    def add_student(self, student: Student) -> int:
-        self.cursor.execute("""
-                            INSERT INTO students (first_name, last_name, patronymic, group_name, grade1, grade2, grade3,
-                                                  grade4)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (student.first_name, student.last_name, student.patronymic, student.group,
-                                  student.grades[0], student.grades[1], student.grades[2], student.grades[3]))
-        self.conn.commit()
-        return self.cursor.lastrowid
-
-    def get_all_students(self) -> List[Student]:
-        self.cursor.execute("SELECT * FROM students")
-        return [Student(id=row[0], first_name=row[1], last_name=row[2],
-                        patronymic=row[3], group=row[4], grades=[row[5], row[6], row[7], row[8]])
-                for row in self.cursor.fetchall()]
-
-    def get_student_by_id(self, student_id: int) -> Optional[Student]:
-        self.cursor.execute("SELECT * FROM students WHERE id=?", (student_id,))
-        row = self.cursor.fetchone()
-        if row:
-            return Student(id=row[0], first_name=row[1], last_name=row[2],
-                           patronymic=row[3], group=row[4], grades=[row[5], row[6], row[7], row[8]])
-        return None
-
-    def update_student(self, student: Student) -> bool:
-        if student.id is None: return False
-        self.cursor.execute("""
-                            UPDATE students
-                            SET first_name=?,
-                                last_name=?,
-                                patronymic=?,
-                                group_name=?,
-                                grade1=?,
-                                grade2=?,
-                                grade3=?,
-                                grade4=?
-                            WHERE id = ?
-                            """, (student.first_name, student.last_name, student.patronymic, student.group,
-                                  student.grades[0], student.grades[1], student.grades[2], student.grades[3],
-                                  student.id))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
-
-    def delete_student(self, student_id: int) -> bool:
-        self.cursor.execute("DELETE FROM students WHERE id=?", (student_id,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
-
-    def get_groups(self) -> List[str]:
-        self.cursor.execute("SELECT DISTINCT group_name FROM students ORDER BY group_name")
-        return [row[0] for row in self.cursor.fetchall()]
-
-    def get_students_by_group(self, group_name: str) -> List[Student]:
-        self.cursor.execute("SELECT * FROM students WHERE group_name=?", (group_name,))
-        return [Student(id=row[0], first_name=row[1], last_name=row[2],
-                        patronymic=row[3], group=row[4], grades=[row[5], row[6], row[7], row[8]])
-                for row in self.cursor.fetchall()]
-
-    def close(self):
-        self.conn.close()
-
-
-class StudentApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Управление студентами")
-        self.root.geometry("900x500")
-        self.db = StudentDatabase()
-        self.create_widgets()
-        self.refresh_table()
-
-    def create_widgets(self):
-        toolbar = tk.Frame(self.root, bd=1, relief=tk.RAISED)
-        toolbar.pack(side=tk.TOP, fill=tk.X)
-
-        buttons = [
-            (" Добавить", self.add_student_dialog, "#27ae60"),
-            (" Редактировать", self.edit_student_dialog, "#f39c12"),
-            (" Удалить", self.delete_student, "#c0392b"),
-            (" Обновить", self.refresh_table, "#2980b9"),
-            (" Средний балл группы", self.group_average_dialog, "#8e44ad")
-        ]
-
-        for text, cmd, color in buttons:
-            tk.Button(toolbar, text=text, command=cmd, bg=color, fg="white",
-                      font=("Arial", 9, "bold")).pack(side=tk.LEFT, padx=2, pady=2)
-
-        search_frame = tk.Frame(self.root)
-        search_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
-        tk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT)
-        self.search_var = tk.StringVar()
-        self.search_var.trace('w', lambda *args: self.filter_table())
-        tk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5)
-
-        self.tree_frame = tk.Frame(self.root)
-        self.tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        columns = ("id", "Фамилия", "Имя", "Отчество", "Группа", "Оценки", "Средний балл")
-        self.tree = ttk.Treeview(self.tree_frame, columns=columns, show="headings")
-
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100 if col == "id" else 120)
-
-        scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.tree.bind('<Double-1>', lambda e: self.view_student_details())
-
-    def refresh_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for s in self.db.get_all_students():
-            self.tree.insert("", tk.END, values=(
-                s.id, s.last_name, s.first_name, s.patronymic, s.group,
-                ", ".join(map(str, s.grades)), f"{s.average_grade():.2f}"
-            ))
-
-    def filter_table(self):
-        text = self.search_var.get().lower()
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for s in self.db.get_all_students():
-            if (text in s.last_name.lower() or text in s.first_name.lower() or
-                    text in s.patronymic.lower() or text in s.group.lower()):
-                self.tree.insert("", tk.END, values=(
-                    s.id, s.last_name, s.first_name, s.patronymic, s.group,
-                    ", ".join(map(str, s.grades)), f"{s.average_grade():.2f}"
-                ))
-
-    def get_selected_id(self):
-        selected = self.tree.selection()
-        if not selected:
-            messagebox.showwarning("Предупреждение", "Выберите студента")
-            return None
-        return self.tree.item(selected[0])['values'][0]
-
-    def add_student_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Добавить студента")
-        dialog.geometry("350x350")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        entries = {}
-        fields = ["Фамилия", "Имя", "Отчество", "Группа"]
-
-        for i, field in enumerate(fields):
-            tk.Label(dialog, text=field + ":").grid(row=i, column=0, padx=10, pady=5, sticky=tk.W)
-            entries[field] = tk.Entry(dialog, width=25)
-            entries[field].grid(row=i, column=1, padx=10, pady=5)
-
-        tk.Label(dialog, text="Оценки (4 через запятую):").grid(row=4, column=0, padx=10, pady=5, sticky=tk.W)
-        grades_entry = tk.Entry(dialog, width=25)
-        grades_entry.grid(row=4, column=1, padx=10, pady=5)
-
-        def save():
-            try:
-                grades = list(map(int, grades_entry.get().split(',')))
-                if len(grades) != 4:
-                    messagebox.showerror("Ошибка", "Введите 4 оценки")
-                    return
-                if not all(1 <= g <= 5 for g in grades):
-                    messagebox.showerror("Ошибка", "Оценки от 1 до 5")
-                    return
-
-                student = Student(
-                    first_name=entries["Имя"].get().strip(),
-                    last_name=entries["Фамилия"].get().strip(),
-                    patronymic=entries["Отчество"].get().strip(),
-                    group=entries["Группа"].get().strip(),
-                    grades=grades
-                )
-
-                if not all([student.first_name, student.last_name, student.patronymic, student.group]):
-                    messagebox.showerror("Ошибка", "Заполните все поля")
-                    return
-
-                self.db.add_student(student)
-                self.refresh_table()
-                dialog.destroy()
-                messagebox.showinfo("Успех", "Студент добавлен")
-            except ValueError:
-                messagebox.showerror("Ошибка", "Оценки должны быть числами")
-
-        tk.Button(dialog, text="Сохранить", command=save, bg="#27ae60", fg="white").grid(row=5, column=0, columnspan=2,
-                                                                                         pady=20)
-
-    def edit_student_dialog(self):
-        student_id = self.get_selected_id()
-        if not student_id: return
-
-        student = self.db.get_student_by_id(student_id)
-        if not student: return
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Редактировать")
-        dialog.geometry("350x350")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        fields = {"Фамилия": student.last_name, "Имя": student.first_name,
-                  "Отчество": student.patronymic, "Группа": student.group}
-        entries = {}
-
-        for i, (field, value) in enumerate(fields.items()):
-            tk.Label(dialog, text=field + ":").grid(row=i, column=0, padx=10, pady=5, sticky=tk.W)
-            entries[field] = tk.Entry(dialog, width=25)
-            entries[field].insert(0, value)
-            entries[field].grid(row=i, column=1, padx=10, pady=5)
-
-        tk.Label(dialog, text="Оценки:").grid(row=4, column=0, padx=10, pady=5, sticky=tk.W)
-        grades_entry = tk.Entry(dialog, width=25)
-        grades_entry.insert(0, ", ".join(map(str, student.grades)))
-        grades_entry.grid(row=4, column=1, padx=10, pady=5)
-
-        def update():
-            try:
-                grades = list(map(int, grades_entry.get().split(',')))
-                if len(grades) != 4 or not all(1 <= g <= 5 for g in grades):
-                    messagebox.showerror("Ошибка", "Введите 4 оценки от 1 до 5")
-                    return
-
-                student.first_name = entries["Имя"].get().strip()
-                student.last_name = entries["Фамилия"].get().strip()
-                student.patronymic = entries["Отчество"].get().strip()
-                student.group = entries["Группа"].get().strip()
-                student.grades = grades
-
-                if not all([student.first_name, student.last_name, student.patronymic, student.group]):
-                    messagebox.showerror("Ошибка", "Заполните все поля")
-                    return
-
-                self.db.update_student(student)
-                self.refresh_table()
-                dialog.destroy()
-                messagebox.showinfo("Успех", "Данные обновлены")
-            except ValueError:
-                messagebox.showerror("Ошибка", "Оценки должны быть числами")
-
-        tk.Button(dialog, text="Обновить", command=update, bg="#f39c12", fg="white").grid(row=5, column=0, columnspan=2,
-                                                                                          pady=20)
-
-    def delete_student(self):
-        student_id = self.get_selected_id()
-        if not student_id: return
-
-        if messagebox.askyesno("Подтверждение", "Удалить студента?"):
-            self.db.delete_student(student_id)
-            self.refresh_table()
-            messagebox.showinfo("Успех", "Студент удален")
-
-    def view_student_details(self):
-        student_id = self.get_selected_id()
-        if not student_id: return
-
-        s = self.db.get_student_by_id(student_id)
-        if s:
-            msg = (f"ID: {s.id}\nФамилия: {s.last_name}\nИмя: {s.first_name}\n"
-                   f"Отчество: {s.patronymic}\nГруппа: {s.group}\n"
-                   f"Оценки: {', '.join(map(str, s.grades))}\n"
-                   f"Средний балл: {s.average_grade():.2f}")
-            messagebox.showinfo("Информация о студенте", msg)
-
-    def group_average_dialog(self):
-        groups = self.db.get_groups()
-        if not groups:
-            messagebox.showinfo("Инфо", "Нет групп")
-            return
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Средний балл группы")
-        dialog.geometry("300x200")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Выберите группу:").pack(pady=10)
-        group_var = tk.StringVar()
-        combo = ttk.Combobox(dialog, textvariable=group_var, values=groups, state="readonly")
-        combo.pack(pady=5)
-        if groups: combo.current(0)
-
-        def show():
-            group = group_var.get()
-            students = self.db.get_students_by_group(group)
-            if students:
-                avg = sum(s.average_grade() for s in students) / len(students)
-                msg = f"Группа: {group}\nКол-во: {len(students)}\nСредний балл: {avg:.2f}"
-                messagebox.showinfo("Результат", msg)
-            dialog.destroy()
-
-        tk.Button(dialog, text="Показать", command=show, bg="#8e44ad", fg="white").pack(pady=10)
-
-    def __del__(self):
-        if hasattr(self, 'db'): self.db.close()
-
-
-def main():
-    root = tk.Tk()
-    app = StudentApp(root)
-    root.mainloop()
-
-
-if __name__ == "__main__":
-    try:
-        main()
-    except Exception as e:
+import re
+import sqlite3
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox, ttk
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Один текст запроса на все выборки: sqlite3 кэширует скомпилированные
+# выражения по точному совпадению строки SQL
+_SELECT_STUDENTS = "SELECT *, (grade1 + grade2 + grade3 + grade4) / 4.0 AS avg FROM students"
+
+# Проверка и разбор четырёх оценок одним проходом регулярного выражения
+_GRADES_RE = re.compile(r'^\s*([1-5])\s*,\s*([1-5])\s*,\s*([1-5])\s*,\s*([1-5])\s*$')
+
+
+@dataclass(slots=True)
+class Student:
+    first_name: str
+    last_name: str
+    patronymic: str
+    group: str
+    grades: List[int]
+    id: Optional[int] = None
+    avg: Optional[float] = None
+
+    def average_grade(self) -> float:
+        if self.avg is not None:
+            return self.avg
+        return sum(self.grades) / len(self.grades) if self.grades else 0.0
+
+
+def _make_student(row) -> Student:
+    # Позиционная распаковка строки (id, ФИО, группа, оценки, avg)
+    return Student(row[1], row[2], row[3], row[4], list(row[5:9]), row[0], row[9])
+
+
+class StudentDatabase:
+    def __init__(self, db_name: str = "students.db"):
+        self.conn = sqlite3.connect(db_name, cached_statements=128, check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-20000")
+        # Встроенный lower() в SQLite понижает только ASCII, кириллицу — нет
+        self.conn.create_function("pylower", 1, str.lower, deterministic=True)
+        self._create_table()
+
+    def _create_table(self):
+        self.conn.execute("""
+                            CREATE TABLE IF NOT EXISTS students
+                            (
+                                id
+                                INTEGER
+                                PRIMARY
+                                KEY
+                                AUTOINCREMENT,
+                                first_name
+                                TEXT,
+                                last_name
+                                TEXT,
+                                patronymic
+                                TEXT,
+                                group_name
+                                TEXT,
+                                grade1
+                                INTEGER,
+                                grade2
+                                INTEGER,
+                                grade3
+                                INTEGER,
+                                grade4
+                                INTEGER
+                            )
+                            """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_students_group ON students(group_name)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_students_last ON students(last_name COLLATE NOCASE)")
+        fts_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='students_fts'").fetchone()
+        self.conn.execute("""
+                            CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+                                first_name, last_name, patronymic, group_name,
+                                content='students', content_rowid='id', tokenize='trigram')
+                            """)
+        self.conn.execute("""
+                            CREATE TRIGGER IF NOT EXISTS students_ai AFTER INSERT ON students BEGIN
+                                INSERT INTO students_fts(rowid, first_name, last_name, patronymic, group_name)
+                                VALUES (new.id, new.first_name, new.last_name, new.patronymic, new.group_name);
+                            END
+                            """)
+        self.conn.execute("""
+                            CREATE TRIGGER IF NOT EXISTS students_ad AFTER DELETE ON students BEGIN
+                                INSERT INTO students_fts(students_fts, rowid, first_name, last_name, patronymic, group_name)
+                                VALUES ('delete', old.id, old.first_name, old.last_name, old.patronymic, old.group_name);
+                            END
+                            """)
+        self.conn.execute("""
+                            CREATE TRIGGER IF NOT EXISTS students_au AFTER UPDATE ON students BEGIN
+                                INSERT INTO students_fts(students_fts, rowid, first_name, last_name, patronymic, group_name)
+                                VALUES ('delete', old.id, old.first_name, old.last_name, old.patronymic, old.group_name);
+                                INSERT INTO students_fts(rowid, first_name, last_name, patronymic, group_name)
+                                VALUES (new.id, new.first_name, new.last_name, new.patronymic, new.group_name);
+                            END
+                            """)
+        if not fts_exists:
+            # Индексируем уже существующие строки: база могла быть создана до FTS
+            self.conn.execute("INSERT INTO students_fts(students_fts) VALUES('rebuild')")
+
+    def add_student(self, student: Student) -> int:
+        cur = self.conn.execute("""
+                            INSERT INTO students (first_name, last_name, patronymic, group_name, grade1, grade2, grade3,
+                                                  grade4)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                            """, (student.first_name, student.last_name, student.patronymic, student.group,
+                                  student.grades[0], student.grades[1], student.grades[2], student.grades[3]))
+        return cur.lastrowid
+
+    def add_students(self, students: List[Student]):
+        self._run_in_transaction("""
+                                 INSERT INTO students (first_name, last_name, patronymic, group_name, grade1, grade2,
+                                                       grade3, grade4)
+                                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                                 """, [(s.first_name, s.last_name, s.patronymic, s.group,
+                                        s.grades[0], s.grades[1], s.grades[2], s.grades[3]) for s in students])
+
+    def update_students(self, students: List[Student]):
+        self._run_in_transaction("""
+                                 UPDATE students
+                                 SET first_name=?,
+                                     last_name=?,
+                                     patronymic=?,
+                                     group_name=?,
+                                     grade1=?,
+                                     grade2=?,
+                                     grade3=?,
+                                     grade4=?
+                                 WHERE id = ?
+                                 """, [(s.first_name, s.last_name, s.patronymic, s.group,
+                                        s.grades[0], s.grades[1], s.grades[2], s.grades[3],
+                                        s.id) for s in students if s.id is not None])
+
+    def _run_in_transaction(self, sql: str, rows: list):
+        # isolation_level=None: BEGIN/COMMIT выдаём сами, одной транзакцией на пакет
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(sql, rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def get_all_students(self) -> List[Student]:
+        # Курсор на каждый вызов: общий курсор ломается при работе из двух потоков
+        return [_make_student(row) for row in self.conn.execute(_SELECT_STUDENTS)]
+
+    def get_student_by_id(self, student_id: int) -> Optional[Student]:
+        row = self.conn.execute(_SELECT_STUDENTS + " WHERE id=?", (student_id,)).fetchone()
+        if row:
+            return _make_student(row)
+        return None
+
+    def update_student(self, student: Student) -> bool:
+        if student.id is None: return False
+        cur = self.conn.execute("""
+                            UPDATE students
+                            SET first_name=?,
+                                last_name=?,
+                                patronymic=?,
+                                group_name=?,
+                                grade1=?,
+                                grade2=?,
+                                grade3=?,
+                                grade4=?
+                            WHERE id = ?
+                            """, (student.first_name, student.last_name, student.patronymic, student.group,
+                                  student.grades[0], student.grades[1], student.grades[2], student.grades[3],
+                                  student.id))
+        return cur.rowcount > 0
+
+    def delete_student(self, student_id: int) -> bool:
+        cur = self.conn.execute("DELETE FROM students WHERE id=?", (student_id,))
+        return cur.rowcount > 0
+
+    def get_groups(self) -> List[str]:
+        cur = self.conn.execute("SELECT DISTINCT group_name FROM students ORDER BY group_name")
+        return [row[0] for row in cur.fetchall()]
+
+    def search(self, query: str) -> List[Student]:
+        cur = self.conn.execute("""
+                               SELECT s.*, (s.grade1 + s.grade2 + s.grade3 + s.grade4) / 4.0 AS avg
+                               FROM students_fts f JOIN students s ON s.id = f.rowid
+                               WHERE students_fts MATCH ?
+                               """, ('"' + query.replace('"', '""') + '"',))
+        return [_make_student(row) for row in cur]
+
+    def search_like(self, needle: str) -> List[Student]:
+        pattern = f"%{needle}%"
+        cur = self.conn.execute(_SELECT_STUDENTS + """
+                               WHERE pylower(last_name) LIKE ? OR pylower(first_name) LIKE ?
+                                  OR pylower(patronymic) LIKE ? OR pylower(group_name) LIKE ?""",
+                                (pattern, pattern, pattern, pattern))
+        return [_make_student(row) for row in cur]
+
+    def get_students_by_group(self, group_name: str) -> List[Student]:
+        cur = self.conn.execute(_SELECT_STUDENTS + " WHERE group_name=?", (group_name,))
+        return [_make_student(row) for row in cur]
+
+    def group_average(self, group_name: str) -> tuple:
+        return self.conn.execute("""
+                                 SELECT AVG((grade1 + grade2 + grade3 + grade4) / 4.0), COUNT(*)
+                                 FROM students
+                                 WHERE group_name = ?
+                                 """, (group_name,)).fetchone()
+
+    def close(self):
+        self.conn.close()
+
+
+class StudentApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Управление студентами")
+        self.root.geometry("900x500")
+        self.db = StudentDatabase()
+        # Чтения выполняются в фоновом потоке, чтобы не блокировать цикл Tk
+        self._db_executor = ThreadPoolExecutor(max_workers=1)
+        self._db_lock = threading.Lock()
+        self._students_cache: List[Student] = []
+        self._by_id: dict = {}
+        self._search_keys: List[str] = []
+        self._all_iids: List[str] = []
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.create_widgets()
+        self.refresh_table()
+
+    def create_widgets(self):
+        toolbar = tk.Frame(self.root, bd=1, relief=tk.RAISED)
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+
+        buttons = [
+            (" Добавить", self.add_student_dialog, "#27ae60"),
+            (" Редактировать", self.edit_student_dialog, "#f39c12"),
+            (" Удалить", self.delete_student, "#c0392b"),
+            (" Обновить", self.refresh_table, "#2980b9"),
+            (" Средний балл группы", self.group_average_dialog, "#8e44ad")
+        ]
+
+        for text, cmd, color in buttons:
+            tk.Button(toolbar, text=text, command=cmd, bg=color, fg="white",
+                      font=("Arial", 9, "bold")).pack(side=tk.LEFT, padx=2, pady=2)
+
+        search_frame = tk.Frame(self.root)
+        search_frame.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        tk.Label(search_frame, text="Поиск:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self._filter_after_id = None
+        self.search_var.trace('w', lambda *args: self._schedule_filter())
+        tk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=5)
+
+        self.tree_frame = tk.Frame(self.root)
+        self.tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        columns = ("id", "Фамилия", "Имя", "Отчество", "Группа", "Оценки", "Средний балл")
+        self.tree = ttk.Treeview(self.tree_frame, columns=columns, show="headings")
+
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=100 if col == "id" else 120)
+
+        scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind('<Double-1>', lambda e: self.view_student_details())
+
+    def refresh_table(self):
+        future = self._db_executor.submit(self._fetch_all)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_students_loaded, f.result()))
+
+    def _fetch_all(self) -> List[Student]:
+        with self._db_lock:
+            return self.db.get_all_students()
+
+    def _on_students_loaded(self, students: List[Student]):
+        self._set_cache(students)
+        self._populate_tree(self._students_cache)
+
+    def _reapply_view(self):
+        if self.search_var.get():
+            # Сначала пересоздаём строки из свежего кэша: после добавления или
+            # удаления фильтру нужны актуальные iid и значения
+            self._set_cache(self._fetch_all())
+            self._populate_tree(self._students_cache)
+            self.filter_table()
+        else:
+            self.refresh_table()
+
+    def _set_cache(self, students: List[Student]):
+        self._students_cache = students
+        self._by_id = {s.id: s for s in students}
+        # Ключи поиска понижаются один раз при загрузке, а не на каждое нажатие
+        self._search_keys = [f"{s.last_name}\x1f{s.first_name}\x1f{s.patronymic}\x1f{s.group}".lower()
+                             for s in students]
+
+    def _populate_tree(self, students: List[Student]):
+        # Удаляем по сохранённым iid: get_children() не видит отцепленные строки
+        if self._all_iids:
+            self.tree.delete(*self._all_iids)
+        rows = [(s.id, s.last_name, s.first_name, s.patronymic, s.group,
+                 ", ".join(map(str, s.grades)), f"{s.average_grade():.2f}")
+                for s in students]
+        self._all_iids = [str(s.id) for s in students]
+        for iid, values in zip(self._all_iids, rows):
+            self.tree.insert("", tk.END, iid=iid, values=values)
+
+    def _schedule_filter(self):
+        if self._filter_after_id:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(150, self.filter_table)
+
+    def filter_table(self):
+        self._filter_after_id = None
+        text = self.search_var.get().lower()
+        if len(text) >= 3:
+            # Триграммный индекс FTS5 работает с подстроками от 3 символов
+            with self._db_lock:
+                match_ids = {s.id for s in self.db.search(text)}
+        elif self._students_cache:
+            match_ids = {s.id for s, key in zip(self._students_cache, self._search_keys)
+                         if text in key}
+        else:
+            # Кэш ещё не загружен — подстрочный фильтр выполняет SQLite
+            with self._db_lock:
+                match_ids = {s.id for s in self.db.search_like(text)}
+        # Вместо пересоздания строк отцепляем/возвращаем существующие iid
+        for s in self._students_cache:
+            iid = str(s.id)
+            if s.id in match_ids:
+                self.tree.move(iid, '', tk.END)
+            else:
+                self.tree.detach(iid)
+
+    def get_selected_id(self):
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showwarning("Предупреждение", "Выберите студента")
+            return None
+        return self.tree.item(selected[0])['values'][0]
+
+    def add_student_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Добавить студента")
+        dialog.geometry("350x350")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        entries = {}
+        fields = ["Фамилия", "Имя", "Отчество", "Группа"]
+
+        for i, field in enumerate(fields):
+            tk.Label(dialog, text=field + ":").grid(row=i, column=0, padx=10, pady=5, sticky=tk.W)
+            entries[field] = tk.Entry(dialog, width=25)
+            entries[field].grid(row=i, column=1, padx=10, pady=5)
+
+        tk.Label(dialog, text="Оценки (4 через запятую):").grid(row=4, column=0, padx=10, pady=5, sticky=tk.W)
+        grades_entry = tk.Entry(dialog, width=25)
+        grades_entry.grid(row=4, column=1, padx=10, pady=5)
+
+        def save():
+            m = _GRADES_RE.match(grades_entry.get())
+            if not m:
+                messagebox.showerror("Ошибка", "Введите 4 оценки от 1 до 5 через запятую")
+                return
+            grades = [int(g) for g in m.groups()]
+
+            student = Student(
+                first_name=entries["Имя"].get().strip(),
+                last_name=entries["Фамилия"].get().strip(),
+                patronymic=entries["Отчество"].get().strip(),
+                group=entries["Группа"].get().strip(),
+                grades=grades
+            )
+
+            if not all([student.first_name, student.last_name, student.patronymic, student.group]):
+                messagebox.showerror("Ошибка", "Заполните все поля")
+                return
+
+            with self._db_lock:
+                self.db.add_student(student)
+            self._reapply_view()
+            dialog.destroy()
+            messagebox.showinfo("Успех", "Студент добавлен")
+
+        tk.Button(dialog, text="Сохранить", command=save, bg="#27ae60", fg="white").grid(row=5, column=0, columnspan=2,
+                                                                                         pady=20)
+
+    def edit_student_dialog(self):
+        student_id = self.get_selected_id()
+        if not student_id: return
+
+        student = self._by_id.get(student_id)
+        if not student: return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Редактировать")
+        dialog.geometry("350x350")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        fields = {"Фамилия": student.last_name, "Имя": student.first_name,
+                  "Отчество": student.patronymic, "Группа": student.group}
+        entries = {}
+
+        for i, (field, value) in enumerate(fields.items()):
+            tk.Label(dialog, text=field + ":").grid(row=i, column=0, padx=10, pady=5, sticky=tk.W)
+            entries[field] = tk.Entry(dialog, width=25)
+            entries[field].insert(0, value)
+            entries[field].grid(row=i, column=1, padx=10, pady=5)
+
+        tk.Label(dialog, text="Оценки:").grid(row=4, column=0, padx=10, pady=5, sticky=tk.W)
+        grades_entry = tk.Entry(dialog, width=25)
+        grades_entry.insert(0, ", ".join(map(str, student.grades)))
+        grades_entry.grid(row=4, column=1, padx=10, pady=5)
+
+        def update():
+            m = _GRADES_RE.match(grades_entry.get())
+            if not m:
+                messagebox.showerror("Ошибка", "Введите 4 оценки от 1 до 5 через запятую")
+                return
+
+            first_name = entries["Имя"].get().strip()
+            last_name = entries["Фамилия"].get().strip()
+            patronymic = entries["Отчество"].get().strip()
+            group = entries["Группа"].get().strip()
+
+            if not all([first_name, last_name, patronymic, group]):
+                messagebox.showerror("Ошибка", "Заполните все поля")
+                return
+
+            # student — общий объект из кэша: присваиваем только после проверок
+            student.first_name = first_name
+            student.last_name = last_name
+            student.patronymic = patronymic
+            student.group = group
+            student.grades = [int(g) for g in m.groups()]
+
+            with self._db_lock:
+                self.db.update_student(student)
+            self._reapply_view()
+            dialog.destroy()
+            messagebox.showinfo("Успех", "Данные обновлены")
+
+        tk.Button(dialog, text="Обновить", command=update, bg="#f39c12", fg="white").grid(row=5, column=0, columnspan=2,
+                                                                                          pady=20)
+
+    def delete_student(self):
+        student_id = self.get_selected_id()
+        if not student_id: return
+
+        if messagebox.askyesno("Подтверждение", "Удалить студента?"):
+            with self._db_lock:
+                self.db.delete_student(student_id)
+            self._reapply_view()
+            messagebox.showinfo("Успех", "Студент удален")
+
+    def view_student_details(self):
+        student_id = self.get_selected_id()
+        if not student_id: return
+
+        s = self._by_id.get(student_id)
+        if s:
+            msg = (f"ID: {s.id}\nФамилия: {s.last_name}\nИмя: {s.first_name}\n"
+                   f"Отчество: {s.patronymic}\nГруппа: {s.group}\n"
+                   f"Оценки: {', '.join(map(str, s.grades))}\n"
+                   f"Средний балл: {s.average_grade():.2f}")
+            messagebox.showinfo("Информация о студенте", msg)
+
+    def group_average_dialog(self):
+        with self._db_lock:
+            groups = self.db.get_groups()
+        if not groups:
+            messagebox.showinfo("Инфо", "Нет групп")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Средний балл группы")
+        dialog.geometry("300x200")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Выберите группу:").pack(pady=10)
+        group_var = tk.StringVar()
+        combo = ttk.Combobox(dialog, textvariable=group_var, values=groups, state="readonly")
+        combo.pack(pady=5)
+        if groups: combo.current(0)
+
+        def show():
+            group = group_var.get()
+            with self._db_lock:
+                avg, count = self.db.group_average(group)
+            if count:
+                msg = f"Группа: {group}\nКол-во: {count}\nСредний балл: {avg:.2f}"
+                messagebox.showinfo("Результат", msg)
+            dialog.destroy()
+
+        tk.Button(dialog, text="Показать", command=show, bg="#8e44ad", fg="white").pack(pady=10)
+
+    def _on_close(self):
+        self._db_executor.shutdown(wait=True)
+        # Сбрасываем WAL в основной файл, чтобы база не разрасталась между сеансами
+        self.db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.db.close()
+        self.root.destroy()
+
+
+def main():
+    root = tk.Tk()
+    app = StudentApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
         messagebox.showerror("Ошибка", f"Не удалось запустить программу: {e}")
\ No newline at end of file
@@ -1,729 +1,869 @@
-import sqlite3
-import tkinter as tk
-from tkinter import messagebox, ttk
-from dataclasses import dataclass
-from typing import List, Optional, Dict
-from datetime import datetime
-
-@dataclass
-class Ingredient:
-    """Ингредиент (алкогольный напиток)"""
-    id: Optional[int]
-    name: str
-    alcohol_percent: float
-    volume_ml: float
-    quantity: int
-    price_per_unit: float
-
-    @property
-    def total_volume(self) -> float:
-        return self.volume_ml * self.quantity
-
-@dataclass
-class Cocktail:
-    """Коктейль"""
-    id: Optional[int]
-    name: str
-    price: float
-
-@dataclass
-class Sale:
-    """Продажа"""
-    id: Optional[int]
-    item_type: str
-    item_id: int
-    quantity: float
-    total_price: float
-    date: str
-
-class DrinkDatabase:
-    def __init__(self, db_name: str = "drinks.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
-        self._create_tables()
-
-    def _create_tables(self):
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ingredients (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                alcohol_percent REAL NOT NULL,
-                volume_ml REAL NOT NULL,
-                quantity INTEGER NOT NULL DEFAULT 0,
-                price_per_unit REAL NOT NULL
-            )
-        """)
-
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cocktails (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                price REAL NOT NULL
-            )
-        """)
-
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS recipes (
-                cocktail_id INTEGER,
-                ingredient_id INTEGER,
-                volume_ml REAL NOT NULL,
-                FOREIGN KEY (cocktail_id) REFERENCES cocktails (id) ON DELETE CASCADE,
-                FOREIGN KEY (ingredient_id) REFERENCES ingredients (id) ON DELETE CASCADE,
-                PRIMARY KEY (cocktail_id, ingredient_id)
-            )
-        """)
-
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sales (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_type TEXT NOT NULL,
-                item_id INTEGER NOT NULL,
-                quantity REAL NOT NULL,
-                total_price REAL NOT NULL,
-                date TEXT NOT NULL
-            )
-        """)
-
-        self.conn.commit()
-
-    def add_ingredient(self, ingredient: Ingredient) -> int:
-        try:
-            self.cursor.execute("""
-                INSERT INTO ingredients (name, alcohol_percent, volume_ml, quantity, price_per_unit)
-                VALUES (?, ?, ?, ?, ?)
-            """, (ingredient.name, ingredient.alcohol_percent, ingredient.volume_ml,
-                  ingredient.quantity, ingredient.price_per_unit))
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.IntegrityError:
-            raise ValueError(f"Ингредиент '{ingredient.name}' уже существует")
-
-    def get_all_ingredients(self) -> List[Ingredient]:
-        self.cursor.execute("SELECT * FROM ingredients ORDER BY name")
-        return [Ingredient(
-            id=row['id'],
-            name=row['name'],
-            alcohol_percent=row['alcohol_percent'],
-            volume_ml=row['volume_ml'],
-            quantity=row['quantity'],
-            price_per_unit=row['price_per_unit']
-        ) for row in self.cursor.fetchall()]
-
-    def get_ingredient_by_id(self, ing_id: int) -> Optional[Ingredient]:
-        self.cursor.execute("SELECT * FROM ingredients WHERE id=?", (ing_id,))
-        row = self.cursor.fetchone()
-        if row:
-            return Ingredient(
-                id=row['id'], name=row['name'], alcohol_percent=row['alcohol_percent'],
-                volume_ml=row['volume_ml'], quantity=row['quantity'], price_per_unit=row['price_per_unit']
-            )
-        return None
-
-    def update_ingredient_quantity(self, ing_id: int, delta: int) -> bool:
-        self.cursor.execute("UPDATE ingredients SET quantity = quantity + ? WHERE id=?", (delta, ing_id))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
-
-    def add_cocktail(self, name: str, price: float, recipe: Dict[int, float]) -> int:
-        try:
-            self.cursor.execute("INSERT INTO cocktails (name, price) VALUES (?, ?)", (name, price))
-            cocktail_id = self.cursor.lastrowid
-
-            for ing_id, volume in recipe.items():
-                self.cursor.execute("""
-                    INSERT INTO recipes (cocktail_id, ingredient_id, volume_ml)
-                    VALUES (?, ?, ?)
-                """, (cocktail_id, ing_id, volume))
-
-            self.conn.commit()
-            return cocktail_id
-        except sqlite3.IntegrityError:
-            raise ValueError(f"Коктейль '{name}' уже существует")
-
-    def get_all_cocktails(self) -> List[Dict]:
-        self.cursor.execute("SELECT * FROM cocktails ORDER BY name")
-        cocktails = []
-        for row in self.cursor.fetchall():
-            self.cursor.execute("""
-                SELECT r.volume_ml, i.alcohol_percent, i.name
-                FROM recipes r
-                JOIN ingredients i ON r.ingredient_id = i.id
-                WHERE r.cocktail_id = ?
-            """, (row['id'],))
-            recipe = self.cursor.fetchall()
-
-            total_alcohol = 0
-            total_volume = 0
-            recipe_dict = {}
-            for r in recipe:
-                vol = r['volume_ml']
-                alcohol = r['alcohol_percent']
-                total_alcohol += vol * alcohol / 100
-                total_volume += vol
-                recipe_dict[r['name']] = vol
-
-            alcohol_percent = (total_alcohol / total_volume * 100) if total_volume > 0 else 0
-
-            cocktails.append({
-                'id': row['id'],
-                'name': row['name'],
-                'price': row['price'],
-                'alcohol_percent': round(alcohol_percent, 1),
-                'recipe': recipe_dict,
-                'volume': total_volume
-            })
-        return cocktails
-
-    def get_cocktail_by_id(self, cocktail_id: int) -> Optional[Dict]:
-        self.cursor.execute("SELECT * FROM cocktails WHERE id=?", (cocktail_id,))
-        row = self.cursor.fetchone()
-        if not row:
-            return None
-
-        self.cursor.execute("""
-            SELECT r.volume_ml, i.id, i.name, i.alcohol_percent
-            FROM recipes r
-            JOIN ingredients i ON r.ingredient_id = i.id
-            WHERE r.cocktail_id = ?
-        """, (cocktail_id,))
-        recipe_rows = self.cursor.fetchall()
-
-        recipe = {}
-        total_alcohol = 0
-        total_volume = 0
-
-        for r in recipe_rows:
-            recipe[r['id']] = r['volume_ml']
-            total_alcohol += r['volume_ml'] * r['alcohol_percent'] / 100
-            total_volume += r['volume_ml']
-
-        alcohol_percent = (total_alcohol / total_volume * 100) if total_volume > 0 else 0
-
-        return {
-            'id': row['id'],
-            'name': row['name'],
-            'price': row['price'],
-            'recipe': recipe,
-            'alcohol_percent': round(alcohol_percent, 1),
-            'volume': total_volume
-        }
-
-    def check_cocktail_availability(self, cocktail_id: int) -> tuple[bool, str]:
-        cocktail = self.get_cocktail_by_id(cocktail_id)
-        if not cocktail:
-            return False, "Коктейль не найден"
-
-        for ing_id, need_vol in cocktail['recipe'].items():
-            ing = self.get_ingredient_by_id(ing_id)
-            if not ing:
-                return False, f"Ингредиент ID {ing_id} не найден"
-
-            if ing.quantity <= 0:
-                return False, f"Нет {ing.name} на складе"
-
-            available_vol = ing.quantity * ing.volume_ml
-            if available_vol < need_vol:
-                return False, f"Недостаточно {ing.name}. Нужно {need_vol}мл, есть {available_vol}мл"
-
-        return True, "Доступен"
-
-    def sell_cocktail(self, cocktail_id: int) -> bool:
-        cocktail = self.get_cocktail_by_id(cocktail_id)
-        if not cocktail:
-            messagebox.showerror("Ошибка", "Коктейль не найден")
-            return False
-
-        available, msg = self.check_cocktail_availability(cocktail_id)
-        if not available:
-            messagebox.showerror("Ошибка", msg)
-            return False
-
-        for ing_id, need_vol in cocktail['recipe'].items():
-            ing = self.get_ingredient_by_id(ing_id)
-            units_needed = (need_vol + ing.volume_ml - 1) // ing.volume_ml
-            self.update_ingredient_quantity(ing_id, -units_needed)
-
-        self.cursor.execute("""
-            INSERT INTO sales (item_type, item_id, quantity, total_price, date)
-            VALUES (?, ?, ?, ?, ?)
-        """, ('cocktail', cocktail_id, 1, cocktail['price'], datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
-        self.conn.commit()
-        return True
-
-    def sell_ingredient(self, ing_id: int, quantity: int) -> bool:
-        ing = self.get_ingredient_by_id(ing_id)
-        if not ing:
-            messagebox.showerror("Ошибка", "Ингредиент не найден")
-            return False
-
-        if ing.quantity < quantity:
-            messagebox.showerror("Ошибка", f"Недостаточно {ing.name}. Есть {ing.quantity}, запрошено {quantity}")
-            return False
-
-        total_price = quantity * ing.price_per_unit
-        self.update_ingredient_quantity(ing_id, -quantity)
-
-        self.cursor.execute("""
-            INSERT INTO sales (item_type, item_id, quantity, total_price, date)
-            VALUES (?, ?, ?, ?, ?)
-        """, ('ingredient', ing_id, quantity, total_price, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
-        self.conn.commit()
-        return True
-
-    def restock_ingredient(self, ing_id: int, quantity: int) -> bool:
-        ing = self.get_ingredient_by_id(ing_id)
-        if not ing:
-            messagebox.showerror("Ошибка", "Ингредиент не найден")
-            return False
-
-        self.update_ingredient_quantity(ing_id, quantity)
-        messagebox.showinfo("Успех", f"Добавлено {quantity} ед. {ing.name}")
-        return True
-
-    def get_sales_report(self) -> List[Dict]:
-        self.cursor.execute("SELECT * FROM sales ORDER BY date DESC LIMIT 100")
-        return [dict(row) for row in self.cursor.fetchall()]
-
-    def close(self):
-        self.conn.close()
-
-class DrinkApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title(" I love drink - Учет напитков и коктейлей")
-        self.root.geometry("1000x700")
-        self.db = DrinkDatabase()
-
-        self.status_var = tk.StringVar()
-        self.status_var.set("Готов к работе")
-        status_bar = tk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-        self.notebook = ttk.Notebook(root)
-        self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-        self.create_ingredients_tab()
-        self.create_cocktails_tab()
-        self.create_sales_tab()
-        self.create_reports_tab()
-
-    def create_ingredients_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text=" Ингредиенты")
-
-        toolbar = tk.Frame(tab, bd=1, relief=tk.RAISED)
-        toolbar.pack(side=tk.TOP, fill=tk.X, pady=5)
-
-        tk.Button(toolbar, text=" Добавить ингредиент", command=self.add_ingredient_dialog,
-                  bg="#27ae60", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Пополнить запас", command=self.restock_dialog,
-                  bg="#2980b9", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Обновить", command=self.refresh_ingredients,
-                  bg="#7f8c8d", fg="white").pack(side=tk.LEFT, padx=2)
-
-        columns = ("id", "Название", "Крепость", "Объем ед.", "Кол-во", "Цена за ед.", "Общий объем", "Общая стоимость")
-        self.ing_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
-
-        for col in columns:
-            self.ing_tree.heading(col, text=col)
-            width = 50 if col == "id" else 100
-            self.ing_tree.column(col, width=width)
-
-        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.ing_tree.yview)
-        self.ing_tree.configure(yscrollcommand=scrollbar.set)
-
-        self.ing_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.refresh_ingredients()
-
-    def create_cocktails_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text=" Коктейли")
-
-        toolbar = tk.Frame(tab, bd=1, relief=tk.RAISED)
-        toolbar.pack(side=tk.TOP, fill=tk.X, pady=5)
-
-        tk.Button(toolbar, text=" Добавить коктейль", command=self.add_cocktail_dialog,
-                  bg="#27ae60", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Продать", command=self.sell_cocktail_dialog,
-                  bg="#e67e22", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Обновить", command=self.refresh_cocktails,
-                  bg="#7f8c8d", fg="white").pack(side=tk.LEFT, padx=2)
-
-        columns = ("id", "Название", "Крепость", "Объем", "Цена", "Состав", "Доступность")
-        self.cock_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
-
-        for col in columns:
-            self.cock_tree.heading(col, text=col)
-            width = 50 if col == "id" else 120
-            self.cock_tree.column(col, width=width)
-
-        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.cock_tree.yview)
-        self.cock_tree.configure(yscrollcommand=scrollbar.set)
-
-        self.cock_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.refresh_cocktails()
-
-    def create_sales_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text=" Продажи")
-
-        toolbar = tk.Frame(tab, bd=1, relief=tk.RAISED)
-        toolbar.pack(side=tk.TOP, fill=tk.X, pady=5)
-
-        tk.Button(toolbar, text=" Продать коктейль", command=self.sell_cocktail_dialog,
-                  bg="#e67e22", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Продать ингредиент", command=self.sell_ingredient_dialog,
-                  bg="#e67e22", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Пополнить", command=self.restock_dialog,
-                  bg="#2980b9", fg="white").pack(side=tk.LEFT, padx=2)
-        tk.Button(toolbar, text=" Обновить", command=self.refresh_sales,
-                  bg="#7f8c8d", fg="white").pack(side=tk.LEFT, padx=2)
-
-        columns = ("id", "Тип", "Название", "Кол-во", "Сумма", "Дата")
-        self.sales_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
-
-        for col in columns:
-            self.sales_tree.heading(col, text=col)
-            self.sales_tree.column(col, width=100)
-
-        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.sales_tree.yview)
-        self.sales_tree.configure(yscrollcommand=scrollbar.set)
-
-        self.sales_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.refresh_sales()
-
-    def create_reports_tab(self):
-        tab = ttk.Frame(self.notebook)
-        self.notebook.add(tab, text=" Отчеты")
-
-        btn_frame = tk.Frame(tab)
-        btn_frame.pack(pady=20)
-
-        tk.Button(btn_frame, text=" Отчет по продажам", command=self.show_sales_report,
-                  bg="#8e44ad", fg="white", font=("Arial", 12), width=20).pack(pady=5)
-
-        tk.Button(btn_frame, text=" Остатки на складе", command=self.show_stock_report,
-                  bg="#8e44ad", fg="white", font=("Arial", 12), width=20).pack(pady=5)
-
-        self.report_text = tk.Text(tab, height=20, width=80, font=("Courier", 10))
-        self.report_text.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
-
-    def refresh_ingredients(self):
-        for row in self.ing_tree.get_children():
-            self.ing_tree.delete(row)
-
-        total_value = 0
-        for ing in self.db.get_all_ingredients():
-            total_stock_value = ing.quantity * ing.price_per_unit
-            total_value += total_stock_value
-            self.ing_tree.insert("", tk.END, values=(
-                ing.id, ing.name, f"{ing.alcohol_percent}%", f"{ing.volume_ml}мл",
-                ing.quantity, f"{ing.price_per_unit} руб.", f"{ing.total_volume}мл",
-                f"{total_stock_value} руб."
-            ))
-
-        self.status_var.set(f"Всего ингредиентов: {len(self.db.get_all_ingredients())}, Общая стоимость: {total_value} руб.")
-
-    def add_ingredient_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Добавить ингредиент")
-        dialog.geometry("350x300")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        fields = {}
-        labels = ["Название:", "Крепость (%):", "Объем единицы (мл):", "Количество:", "Цена за ед. (руб.):"]
-
-        for i, label in enumerate(labels):
-            tk.Label(dialog, text=label).grid(row=i, column=0, padx=10, pady=5, sticky=tk.W)
-            entry = tk.Entry(dialog, width=25)
-            entry.grid(row=i, column=1, padx=10, pady=5)
-            fields[label] = entry
-
-        def save():
-            try:
-                name = fields["Название:"].get().strip()
-                alcohol = float(fields["Крепость (%):"].get())
-                volume = float(fields["Объем единицы (мл):"].get())
-                quantity = int(fields["Количество:"].get())
-                price = float(fields["Цена за ед. (руб.):"].get())
-
-                if not name:
-                    messagebox.showerror("Ошибка", "Введите название")
-                    return
-
-                ing = Ingredient(None, name, alcohol, volume, quantity, price)
-                self.db.add_ingredient(ing)
-                self.refresh_ingredients()
-                dialog.destroy()
-                messagebox.showinfo("Успех", "Ингредиент добавлен")
-            except ValueError:
-                messagebox.showerror("Ошибка", "Проверьте правильность ввода чисел")
-            except Exception as e:
-                messagebox.showerror("Ошибка", str(e))
-
-        tk.Button(dialog, text="Сохранить", command=save, bg="#27ae60", fg="white").grid(row=5, column=0, columnspan=2, pady=20)
-
-    def restock_dialog(self):
-        ingredients = self.db.get_all_ingredients()
-        if not ingredients:
-            messagebox.showwarning("Предупреждение", "Нет ингредиентов")
-            return
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Пополнить запас")
-        dialog.geometry("350x200")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Ингредиент:").grid(row=0, column=0, padx=10, pady=5, sticky=tk.W)
-        ing_var = tk.StringVar()
-        ing_combo = ttk.Combobox(dialog, textvariable=ing_var, values=[f"{i.id}: {i.name}" for i in ingredients])
-        ing_combo.grid(row=0, column=1, padx=10, pady=5)
-
-        tk.Label(dialog, text="Количество:").grid(row=1, column=0, padx=10, pady=5, sticky=tk.W)
-        qty_entry = tk.Entry(dialog, width=10)
-        qty_entry.grid(row=1, column=1, padx=10, pady=5)
-
-        def restock():
-            try:
-                ing_id = int(ing_combo.get().split(":")[0])
-                quantity = int(qty_entry.get())
-                if quantity <= 0:
-                    messagebox.showerror("Ошибка", "Количество должно быть положительным")
-                    return
-                self.db.restock_ingredient(ing_id, quantity)
-                self.refresh_ingredients()
-                dialog.destroy()
-            except:
-                messagebox.showerror("Ошибка", "Проверьте ввод")
-
-        tk.Button(dialog, text="Пополнить", command=restock, bg="#2980b9", fg="white").grid(row=2, column=0, columnspan=2, pady=20)
-
-    def refresh_cocktails(self):
-        for row in self.cock_tree.get_children():
-            self.cock_tree.delete(row)
-
-        for c in self.db.get_all_cocktails():
-            available, msg = self.db.check_cocktail_availability(c['id'])
-            recipe_str = ", ".join([f"{name}: {vol}мл" for name, vol in c['recipe'].items()])
-
-            self.cock_tree.insert("", tk.END, values=(
-                c['id'], c['name'], f"{c['alcohol_percent']}%", f"{c['volume']}мл",
-                f"{c['price']} руб.", recipe_str[:50] + "..." if len(recipe_str) > 50 else recipe_str,
-                "✅" if available else "❌"
-            ))
-
-    def add_cocktail_dialog(self):
-        ingredients = self.db.get_all_ingredients()
-        if not ingredients:
-            messagebox.showwarning("Предупреждение", "Сначала добавьте ингредиенты")
-            return
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Добавить коктейль")
-        dialog.geometry("500x400")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Название:").grid(row=0, column=0, padx=10, pady=5, sticky=tk.W)
-        name_entry = tk.Entry(dialog, width=30)
-        name_entry.grid(row=0, column=1, padx=10, pady=5)
-
-        tk.Label(dialog, text="Цена (руб.):").grid(row=1, column=0, padx=10, pady=5, sticky=tk.W)
-        price_entry = tk.Entry(dialog, width=30)
-        price_entry.grid(row=1, column=1, padx=10, pady=5)
-
-        tk.Label(dialog, text="Рецепт:", font=("Arial", 10, "bold")).grid(row=2, column=0, columnspan=2, pady=10)
-
-        recipe_vars = {}
-        for i, ing in enumerate(ingredients, start=3):
-            tk.Label(dialog, text=f"{ing.name} ({ing.volume_ml}мл):").grid(row=i, column=0, padx=10, pady=2, sticky=tk.W)
-            entry = tk.Entry(dialog, width=10)
-            entry.grid(row=i, column=1, padx=10, pady=2, sticky=tk.W)
-            recipe_vars[ing.id] = entry
-
-        def save():
-            try:
-                name = name_entry.get().strip()
-                price = float(price_entry.get())
-
-                recipe = {}
-                for ing_id, entry in recipe_vars.items():
-                    vol = entry.get().strip()
-                    if vol:
-                        recipe[ing_id] = float(vol)
-
-                if not name or not recipe:
-                    messagebox.showerror("Ошибка", "Заполните название и рецепт")
-                    return
-
-                self.db.add_cocktail(name, price, recipe)
-                self.refresh_cocktails()
-                dialog.destroy()
-                messagebox.showinfo("Успех", "Коктейль добавлен")
-            except ValueError:
-                messagebox.showerror("Ошибка", "Проверьте ввод чисел")
-            except Exception as e:
-                messagebox.showerror("Ошибка", str(e))
-
-        tk.Button(dialog, text="Сохранить", command=save, bg="#27ae60", fg="white").grid(row=len(ingredients)+3, column=0, columnspan=2, pady=20)
-
-    def sell_cocktail_dialog(self):
-        cocktails = self.db.get_all_cocktails()
-        if not cocktails:
-            messagebox.showwarning("Предупреждение", "Нет коктейлей")
-            return
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Продажа коктейля")
-        dialog.geometry("400x200")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Коктейль:").pack(pady=10)
-        cocktail_var = tk.StringVar()
-        cocktail_combo = ttk.Combobox(dialog, textvariable=cocktail_var, values=[f"{c['id']}: {c['name']} ({c['price']} руб.)" for c in cocktails])
-        cocktail_combo.pack(pady=5)
-
-        def sell():
-            try:
-                cocktail_id = int(cocktail_combo.get().split(":")[0])
-                if self.db.sell_cocktail(cocktail_id):
-                    self.refresh_ingredients()
-                    self.refresh_cocktails()
-                    self.refresh_sales()
-                    messagebox.showinfo("Успех", "Продажа выполнена")
-                dialog.destroy()
-            except:
-                messagebox.showerror("Ошибка", "Выберите коктейль")
-
-        tk.Button(dialog, text="Продать", command=sell, bg="#e67e22", fg="white").pack(pady=20)
-
-    def sell_ingredient_dialog(self):
-        ingredients = self.db.get_all_ingredients()
-        if not ingredients:
-            messagebox.showwarning("Предупреждение", "Нет ингредиентов")
-            return
-
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Продажа ингредиента")
-        dialog.geometry("400x250")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Ингредиент:").pack(pady=10)
-        ing_var = tk.StringVar()
-        ing_combo = ttk.Combobox(dialog, textvariable=ing_var, values=[f"{i.id}: {i.name} ({i.price_per_unit} руб./ед.)" for i in ingredients])
-        ing_combo.pack(pady=5)
-
-        tk.Label(dialog, text="Количество:").pack(pady=10)
-        qty_entry = tk.Entry(dialog, width=10)
-        qty_entry.pack(pady=5)
-
-        def sell():
-            try:
-                ing_id = int(ing_combo.get().split(":")[0])
-                quantity = int(qty_entry.get())
-                if quantity <= 0:
-                    messagebox.showerror("Ошибка", "Количество должно быть положительным")
-                    return
-                if self.db.sell_ingredient(ing_id, quantity):
-                    self.refresh_ingredients()
-                    self.refresh_sales()
-                    messagebox.showinfo("Успех", "Продажа выполнена")
-                dialog.destroy()
-            except:
-                messagebox.showerror("Ошибка", "Проверьте ввод")
-
-        tk.Button(dialog, text="Продать", command=sell, bg="#e67e22", fg="white").pack(pady=20)
-
-    def refresh_sales(self):
-        for row in self.sales_tree.get_children():
-            self.sales_tree.delete(row)
-
-        sales = self.db.get_sales_report()
-        for sale in sales:
-            if sale['item_type'] == 'cocktail':
-                cocktail = self.db.get_cocktail_by_id(sale['item_id'])
-                name = cocktail['name'] if cocktail else f"Коктейль ID {sale['item_id']}"
-            else:
-                ing = self.db.get_ingredient_by_id(sale['item_id'])
-                name = ing.name if ing else f"Ингредиент ID {sale['item_id']}"
-
-            self.sales_tree.insert("", tk.END, values=(
-                sale['id'],
-                " Коктейль" if sale['item_type'] == 'cocktail' else " Ингредиент",
-                name,
-                sale['quantity'],
-                f"{sale['total_price']} руб.",
-                sale['date']
-            ))
-
-    def show_sales_report(self):
-        self.report_text.delete(1.0, tk.END)
-
-        sales = self.db.get_sales_report()
-        total = 0
-
-        report = "=" * 70 + "\n"
-        report += " " * 25 + "ОТЧЕТ О ПРОДАЖАХ\n"
-        report += "=" * 70 + "\n\n"
-
-        for sale in sales:
-            report += f"{sale['date']} | "
-            if sale['item_type'] == 'cocktail':
-                cocktail = self.db.get_cocktail_by_id(sale['item_id'])
-                name = cocktail['name'] if cocktail else f"Коктейль ID {sale['item_id']}"
-                report += f" {name} | {sale['quantity']} шт. | {sale['total_price']} руб.\n"
-            else:
-                ing = self.db.get_ingredient_by_id(sale['item_id'])
-                name = ing.name if ing else f"Ингредиент ID {sale['item_id']}"
-                report += f" {name} | {sale['quantity']} ед. | {sale['total_price']} руб.\n"
-            total += sale['total_price']
-
-        report += "\n" + "=" * 70 + "\n"
-        report += f"ИТОГО: {total} руб.\n"
-        report += "=" * 70 + "\n"
-
-        self.report_text.insert(1.0, report)
-
-    def show_stock_report(self):
-        self.report_text.delete(1.0, tk.END)
-
-        ingredients = self.db.get_all_ingredients()
-        cocktails = self.db.get_all_cocktails()
-
-        report = "=" * 70 + "\n"
-        report += " " * 25 + "ОСТАТКИ НА СКЛАДЕ\n"
-        report += "=" * 70 + "\n\n"
-
-        report += " ИНГРЕДИЕНТЫ:\n"
-        report += "-" * 50 + "\n"
-        for ing in ingredients:
-            report += f"{ing.name}: {ing.quantity} ед. ({ing.total_volume}мл) - {ing.quantity * ing.price_per_unit} руб.\n"
-
-        report += "\n КОКТЕЙЛИ (доступность):\n"
-        report += "-" * 50 + "\n"
-        for c in cocktails:
-            available, _ = self.db.check_cocktail_availability(c['id'])
-            status = "✅" if available else "❌"
-            report += f"{status} {c['name']}: {c['price']} руб., {c['alcohol_percent']}%\n"
-
-        self.report_text.insert(1.0, report)
-
-def main():
-    root = tk.Tk()
-    app = DrinkApp(root)
-    root.mainloop()
-
-if __name__ == "__main__":
-
-    main()
+import math
+import sqlite3
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox, ttk
+from dataclasses import dataclass
+from typing import List, Optional, Dict
+from itertools import groupby
+
+@dataclass(slots=True)
+class Ingredient:
+    """Ингредиент (алкогольный напиток)"""
+    id: Optional[int]
+    name: str
+    alcohol_percent: float
+    volume_ml: float
+    quantity: int
+    price_per_unit: float
+
+    @property
+    def total_volume(self) -> float:
+        return self.volume_ml * self.quantity
+
+@dataclass(slots=True)
+class Cocktail:
+    """Коктейль"""
+    id: Optional[int]
+    name: str
+    price: float
+
+@dataclass(slots=True)
+class Sale:
+    """Продажа"""
+    id: Optional[int]
+    item_type: str
+    item_id: int
+    quantity: float
+    total_price: float
+    date: str
+
+class DrinkDatabase:
+    def __init__(self, db_name: str = "drinks.db"):
+        # isolation_level=None: автокоммит SQLite, транзакции начинаем явно
+        self.conn = sqlite3.connect(db_name, cached_statements=256, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-64000")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.row_factory = sqlite3.Row
+        self.cursor = self.conn.cursor()
+        self._create_tables()
+
+    def _create_tables(self):
+        # Один executescript: весь DDL разбирается и выполняется за один вызов
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ingredients (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                alcohol_percent REAL NOT NULL,
+                volume_ml REAL NOT NULL,
+                quantity INTEGER NOT NULL DEFAULT 0,
+                price_per_unit REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS cocktails (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                price REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS recipes (
+                cocktail_id INTEGER,
+                ingredient_id INTEGER,
+                volume_ml REAL NOT NULL,
+                FOREIGN KEY (cocktail_id) REFERENCES cocktails (id) ON DELETE CASCADE,
+                FOREIGN KEY (ingredient_id) REFERENCES ingredients (id) ON DELETE CASCADE,
+                PRIMARY KEY (cocktail_id, ingredient_id)
+            );
+
+            CREATE TABLE IF NOT EXISTS sales (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_type TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                quantity REAL NOT NULL,
+                total_price REAL NOT NULL,
+                date TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'))
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(date DESC);
+            CREATE INDEX IF NOT EXISTS idx_sales_item ON sales(item_type, item_id);
+            CREATE INDEX IF NOT EXISTS idx_recipes_ingredient ON recipes(ingredient_id);
+        """)
+        self._migrate_sales_date_default()
+
+    def _migrate_sales_date_default(self):
+        # Базы, созданные до появления default у sales.date, перестраиваем один раз:
+        # CREATE TABLE IF NOT EXISTS существующую таблицу не обновляет
+        date_col = next(r for r in self.conn.execute("PRAGMA table_info(sales)")
+                        if r['name'] == 'date')
+        if date_col['dflt_value'] is not None:
+            return
+        self.conn.executescript("""
+            BEGIN;
+            ALTER TABLE sales RENAME TO sales_old;
+            CREATE TABLE sales (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_type TEXT NOT NULL,
+                item_id INTEGER NOT NULL,
+                quantity REAL NOT NULL,
+                total_price REAL NOT NULL,
+                date TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'))
+            );
+            INSERT INTO sales SELECT id, item_type, item_id, quantity, total_price, date FROM sales_old;
+            DROP TABLE sales_old;
+            CREATE INDEX IF NOT EXISTS idx_sales_date ON sales(date DESC);
+            CREATE INDEX IF NOT EXISTS idx_sales_item ON sales(item_type, item_id);
+            COMMIT;
+        """)
+
+    def add_ingredient(self, ingredient: Ingredient) -> int:
+        try:
+            self.cursor.execute("""
+                INSERT INTO ingredients (name, alcohol_percent, volume_ml, quantity, price_per_unit)
+                VALUES (?, ?, ?, ?, ?)
+            """, (ingredient.name, ingredient.alcohol_percent, ingredient.volume_ml,
+                  ingredient.quantity, ingredient.price_per_unit))
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Ингредиент '{ingredient.name}' уже существует")
+
+    def get_all_ingredients(self) -> List[Ingredient]:
+        # Порядок колонок совпадает с порядком полей Ingredient — распаковываем позиционно
+        self.cursor.execute(
+            "SELECT id, name, alcohol_percent, volume_ml, quantity, price_per_unit FROM ingredients ORDER BY name")
+        return [Ingredient(*row) for row in self.cursor]
+
+    def get_ingredient_by_id(self, ing_id: int) -> Optional[Ingredient]:
+        self.cursor.execute(
+            "SELECT id, name, alcohol_percent, volume_ml, quantity, price_per_unit FROM ingredients WHERE id=?",
+            (ing_id,))
+        row = self.cursor.fetchone()
+        if row:
+            return Ingredient(*row)
+        return None
+
+    def get_ingredients_by_ids(self, ids: List[int]) -> Dict[int, Ingredient]:
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        self.cursor.execute(
+            f"SELECT id, name, alcohol_percent, volume_ml, quantity, price_per_unit"
+            f" FROM ingredients WHERE id IN ({placeholders})", list(ids))
+        return {row['id']: Ingredient(*row) for row in self.cursor}
+
+    def get_ingredients_with_value(self) -> List[sqlite3.Row]:
+        self.cursor.execute("""
+            SELECT id, name, alcohol_percent, volume_ml, quantity, price_per_unit,
+                   quantity * price_per_unit AS stock_value,
+                   quantity * volume_ml AS total_volume
+            FROM ingredients ORDER BY name
+        """)
+        return self.cursor.fetchall()
+
+    def get_total_stock_value(self) -> float:
+        self.cursor.execute("SELECT COALESCE(SUM(quantity * price_per_unit), 0) FROM ingredients")
+        return self.cursor.fetchone()[0]
+
+    def update_ingredient_quantity(self, ing_id: int, delta: int) -> bool:
+        self.cursor.execute("UPDATE ingredients SET quantity = quantity + ? WHERE id=?", (delta, ing_id))
+        return self.cursor.rowcount > 0
+
+    def add_cocktail(self, name: str, price: float, recipe: Dict[int, float]) -> int:
+        self.cursor.execute("BEGIN")
+        try:
+            self.cursor.execute("INSERT INTO cocktails (name, price) VALUES (?, ?)", (name, price))
+            cocktail_id = self.cursor.lastrowid
+
+            self.cursor.executemany("""
+                INSERT INTO recipes (cocktail_id, ingredient_id, volume_ml)
+                VALUES (?, ?, ?)
+            """, [(cocktail_id, ing_id, volume) for ing_id, volume in recipe.items()])
+
+            self.cursor.execute("COMMIT")
+            return cocktail_id
+        except sqlite3.IntegrityError:
+            self.cursor.execute("ROLLBACK")
+            raise ValueError(f"Коктейль '{name}' уже существует")
+
+    def get_all_cocktails(self) -> List[Dict]:
+        self.cursor.execute("""
+            SELECT c.id, c.name, c.price, i.name AS ing_name, r.volume_ml, i.alcohol_percent
+            FROM cocktails c
+            LEFT JOIN recipes r ON r.cocktail_id = c.id
+            LEFT JOIN ingredients i ON i.id = r.ingredient_id
+            ORDER BY c.name, c.id
+        """)
+        cocktails = []
+        for (c_id, name, price), rows in groupby(self.cursor, key=lambda r: (r['id'], r['name'], r['price'])):
+            total_alcohol = 0
+            total_volume = 0
+            recipe_dict = {}
+            for r in rows:
+                if r['ing_name'] is None:
+                    continue
+                vol = r['volume_ml']
+                total_alcohol += vol * r['alcohol_percent'] / 100
+                total_volume += vol
+                recipe_dict[r['ing_name']] = vol
+
+            alcohol_percent = (total_alcohol / total_volume * 100) if total_volume > 0 else 0
+
+            cocktails.append({
+                'id': c_id,
+                'name': name,
+                'price': price,
+                'alcohol_percent': round(alcohol_percent, 1),
+                'recipe': recipe_dict,
+                'volume': total_volume
+            })
+        return cocktails
+
+    def get_cocktail_by_id(self, cocktail_id: int) -> Optional[Dict]:
+        self.cursor.execute("SELECT * FROM cocktails WHERE id=?", (cocktail_id,))
+        row = self.cursor.fetchone()
+        if not row:
+            return None
+
+        self.cursor.execute("""
+            SELECT r.volume_ml, i.id, i.name, i.alcohol_percent
+            FROM recipes r
+            JOIN ingredients i ON r.ingredient_id = i.id
+            WHERE r.cocktail_id = ?
+        """, (cocktail_id,))
+        recipe_rows = self.cursor.fetchall()
+
+        recipe = {}
+        total_alcohol = 0
+        total_volume = 0
+
+        for r in recipe_rows:
+            recipe[r['id']] = r['volume_ml']
+            total_alcohol += r['volume_ml'] * r['alcohol_percent'] / 100
+            total_volume += r['volume_ml']
+
+        alcohol_percent = (total_alcohol / total_volume * 100) if total_volume > 0 else 0
+
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'price': row['price'],
+            'recipe': recipe,
+            'alcohol_percent': round(alcohol_percent, 1),
+            'volume': total_volume
+        }
+
+    def get_cocktails_availability(self) -> Dict[int, bool]:
+        # slack < 0 — хотя бы одного ингредиента не хватает; NULL — рецепт пуст
+        self.cursor.execute("""
+            SELECT c.id,
+                   MIN(CASE WHEN i.quantity <= 0 THEN -1
+                            ELSE i.quantity * i.volume_ml - r.volume_ml END) AS slack
+            FROM cocktails c
+            LEFT JOIN recipes r ON r.cocktail_id = c.id
+            LEFT JOIN ingredients i ON i.id = r.ingredient_id
+            GROUP BY c.id
+        """)
+        return {row['id']: row['slack'] is None or row['slack'] >= 0 for row in self.cursor}
+
+    def check_cocktail_availability(self, cocktail_id: int) -> tuple[bool, str]:
+        self.cursor.execute("SELECT 1 FROM cocktails WHERE id=?", (cocktail_id,))
+        if not self.cursor.fetchone():
+            return False, "Коктейль не найден"
+
+        self.cursor.execute("""
+            SELECT i.name, i.quantity, i.volume_ml, r.volume_ml AS need
+            FROM recipes r
+            JOIN ingredients i ON i.id = r.ingredient_id
+            WHERE r.cocktail_id = ?
+        """, (cocktail_id,))
+        for row in self.cursor:
+            if row['quantity'] <= 0:
+                return False, f"Нет {row['name']} на складе"
+
+            available_vol = row['quantity'] * row['volume_ml']
+            if available_vol < row['need']:
+                return False, f"Недостаточно {row['name']}. Нужно {row['need']}мл, есть {available_vol}мл"
+
+        return True, "Доступен"
+
+    def sell_cocktail(self, cocktail_id: int) -> tuple[bool, str]:
+        cocktail = self.get_cocktail_by_id(cocktail_id)
+        if not cocktail:
+            return False, "Коктейль не найден"
+
+        available, msg = self.check_cocktail_availability(cocktail_id)
+        if not available:
+            return False, msg
+
+        recipe = cocktail['recipe']
+        ingredients = self.get_ingredients_by_ids(list(recipe))
+
+        updates = []
+        for ing_id, need_vol in recipe.items():
+            units_needed = math.ceil(need_vol / ingredients[ing_id].volume_ml)
+            updates.append((units_needed, ing_id))
+
+        # Списание ингредиентов и запись продажи — одна транзакция, один fsync
+        self.cursor.execute("BEGIN")
+        try:
+            self.cursor.executemany("UPDATE ingredients SET quantity = quantity - ? WHERE id = ?", updates)
+            self.cursor.execute("""
+                INSERT INTO sales (item_type, item_id, quantity, total_price)
+                VALUES (?, ?, ?, ?)
+            """, ('cocktail', cocktail_id, 1, cocktail['price']))
+            self.cursor.execute("COMMIT")
+        except Exception:
+            self.cursor.execute("ROLLBACK")
+            raise
+        return True, f"Продан коктейль '{cocktail['name']}'"
+
+    def sell_ingredient(self, ing_id: int, quantity: int) -> tuple[bool, str]:
+        ing = self.get_ingredient_by_id(ing_id)
+        if not ing:
+            return False, "Ингредиент не найден"
+
+        if ing.quantity < quantity:
+            return False, f"Недостаточно {ing.name}. Есть {ing.quantity}, запрошено {quantity}"
+
+        total_price = quantity * ing.price_per_unit
+        self.cursor.execute("BEGIN")
+        try:
+            self.update_ingredient_quantity(ing_id, -quantity)
+            self.cursor.execute("""
+                INSERT INTO sales (item_type, item_id, quantity, total_price)
+                VALUES (?, ?, ?, ?)
+            """, ('ingredient', ing_id, quantity, total_price))
+            self.cursor.execute("COMMIT")
+        except Exception:
+            self.cursor.execute("ROLLBACK")
+            raise
+        return True, f"Продано {quantity} ед. {ing.name}"
+
+    def restock_ingredient(self, ing_id: int, quantity: int) -> tuple[bool, str]:
+        ing = self.get_ingredient_by_id(ing_id)
+        if not ing:
+            return False, "Ингредиент не найден"
+
+        self.update_ingredient_quantity(ing_id, quantity)
+        return True, f"Добавлено {quantity} ед. {ing.name}"
+
+    def get_sales_report(self) -> List[Dict]:
+        self.cursor.execute("""
+            SELECT s.id, s.item_type, s.item_id, s.quantity, s.total_price, s.date,
+                   COALESCE(c.name, i.name) AS item_name
+            FROM sales s
+            LEFT JOIN cocktails c ON s.item_type = 'cocktail' AND c.id = s.item_id
+            LEFT JOIN ingredients i ON s.item_type = 'ingredient' AND i.id = s.item_id
+            ORDER BY s.date DESC LIMIT 100
+        """)
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def close(self):
+        self.conn.close()
+
+class DrinkApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title(" I love drink - Учет напитков и коктейлей")
+        self.root.geometry("1000x700")
+        self.db = DrinkDatabase()
+        # Массовые выборки выполняются в фоновом потоке, чтобы не блокировать цикл Tk
+        self._db_executor = ThreadPoolExecutor(max_workers=1)
+        self._db_lock = threading.Lock()
+        # Кэш списков для диалогов: сбрасывается при обновлении вкладок
+        self._ing_cache = None
+        self._cock_cache = None
+
+        self.status_var = tk.StringVar()
+        self.status_var.set("Готов к работе")
+        status_bar = tk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.notebook = ttk.Notebook(root)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.create_ingredients_tab()
+        self.create_cocktails_tab()
+        self.create_sales_tab()
+        self.create_reports_tab()
+
+    def create_ingredients_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text=" Ингредиенты")
+
+        toolbar = tk.Frame(tab, bd=1, relief=tk.RAISED)
+        toolbar.pack(side=tk.TOP, fill=tk.X, pady=5)
+
+        tk.Button(toolbar, text=" Добавить ингредиент", command=self.add_ingredient_dialog,
+                  bg="#27ae60", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Пополнить запас", command=self.restock_dialog,
+                  bg="#2980b9", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Обновить", command=self.refresh_ingredients,
+                  bg="#7f8c8d", fg="white").pack(side=tk.LEFT, padx=2)
+
+        columns = ("id", "Название", "Крепость", "Объем ед.", "Кол-во", "Цена за ед.", "Общий объем", "Общая стоимость")
+        self.ing_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
+
+        for col in columns:
+            self.ing_tree.heading(col, text=col)
+            width = 50 if col == "id" else 100
+            self.ing_tree.column(col, width=width)
+
+        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.ing_tree.yview)
+        self.ing_tree.configure(yscrollcommand=scrollbar.set)
+
+        self.ing_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.refresh_ingredients()
+
+    def create_cocktails_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text=" Коктейли")
+
+        toolbar = tk.Frame(tab, bd=1, relief=tk.RAISED)
+        toolbar.pack(side=tk.TOP, fill=tk.X, pady=5)
+
+        tk.Button(toolbar, text=" Добавить коктейль", command=self.add_cocktail_dialog,
+                  bg="#27ae60", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Продать", command=self.sell_cocktail_dialog,
+                  bg="#e67e22", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Обновить", command=self.refresh_cocktails,
+                  bg="#7f8c8d", fg="white").pack(side=tk.LEFT, padx=2)
+
+        columns = ("id", "Название", "Крепость", "Объем", "Цена", "Состав", "Доступность")
+        self.cock_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
+
+        for col in columns:
+            self.cock_tree.heading(col, text=col)
+            width = 50 if col == "id" else 120
+            self.cock_tree.column(col, width=width)
+
+        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.cock_tree.yview)
+        self.cock_tree.configure(yscrollcommand=scrollbar.set)
+
+        self.cock_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.refresh_cocktails()
+
+    def create_sales_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text=" Продажи")
+
+        toolbar = tk.Frame(tab, bd=1, relief=tk.RAISED)
+        toolbar.pack(side=tk.TOP, fill=tk.X, pady=5)
+
+        tk.Button(toolbar, text=" Продать коктейль", command=self.sell_cocktail_dialog,
+                  bg="#e67e22", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Продать ингредиент", command=self.sell_ingredient_dialog,
+                  bg="#e67e22", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Пополнить", command=self.restock_dialog,
+                  bg="#2980b9", fg="white").pack(side=tk.LEFT, padx=2)
+        tk.Button(toolbar, text=" Обновить", command=self.refresh_sales,
+                  bg="#7f8c8d", fg="white").pack(side=tk.LEFT, padx=2)
+
+        columns = ("id", "Тип", "Название", "Кол-во", "Сумма", "Дата")
+        self.sales_tree = ttk.Treeview(tab, columns=columns, show="headings", height=15)
+
+        for col in columns:
+            self.sales_tree.heading(col, text=col)
+            self.sales_tree.column(col, width=100)
+
+        scrollbar = ttk.Scrollbar(tab, orient=tk.VERTICAL, command=self.sales_tree.yview)
+        self.sales_tree.configure(yscrollcommand=scrollbar.set)
+
+        self.sales_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.refresh_sales()
+
+    def create_reports_tab(self):
+        tab = ttk.Frame(self.notebook)
+        self.notebook.add(tab, text=" Отчеты")
+
+        btn_frame = tk.Frame(tab)
+        btn_frame.pack(pady=20)
+
+        tk.Button(btn_frame, text=" Отчет по продажам", command=self.show_sales_report,
+                  bg="#8e44ad", fg="white", font=("Arial", 12), width=20).pack(pady=5)
+
+        tk.Button(btn_frame, text=" Остатки на складе", command=self.show_stock_report,
+                  bg="#8e44ad", fg="white", font=("Arial", 12), width=20).pack(pady=5)
+
+        self.report_text = tk.Text(tab, height=20, width=80, font=("Courier", 10))
+        self.report_text.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+
+    def _submit_db(self, fetch, apply):
+        def locked_fetch():
+            with self._db_lock:
+                return fetch()
+
+        future = self._db_executor.submit(locked_fetch)
+        future.add_done_callback(lambda f: self.root.after(0, apply, f.result()))
+
+    def _get_ingredients_cached(self):
+        if self._ing_cache is None:
+            with self._db_lock:
+                self._ing_cache = self.db.get_all_ingredients()
+        return self._ing_cache
+
+    def _get_cocktails_cached(self):
+        if self._cock_cache is None:
+            with self._db_lock:
+                self._cock_cache = self.db.get_all_cocktails()
+        return self._cock_cache
+
+    def refresh_ingredients(self):
+        self._ing_cache = None
+        self._submit_db(
+            lambda: (self.db.get_ingredients_with_value(), self.db.get_total_stock_value()),
+            self._populate_ingredients)
+
+    def _populate_ingredients(self, result):
+        ingredients, total_value = result
+        children = self.ing_tree.get_children()
+        if children:
+            self.ing_tree.delete(*children)
+
+        rows = [(
+            ing['id'], ing['name'], f"{ing['alcohol_percent']}%", f"{ing['volume_ml']}мл",
+            ing['quantity'], f"{ing['price_per_unit']} руб.", f"{ing['total_volume']}мл",
+            f"{ing['stock_value']} руб."
+        ) for ing in ingredients]
+        for values in rows:
+            self.ing_tree.insert("", tk.END, values=values)
+
+        self.status_var.set(f"Всего ингредиентов: {len(ingredients)}, Общая стоимость: {total_value} руб.")
+
+    def add_ingredient_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Добавить ингредиент")
+        dialog.geometry("350x300")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        fields = {}
+        labels = ["Название:", "Крепость (%):", "Объем единицы (мл):", "Количество:", "Цена за ед. (руб.):"]
+
+        for i, label in enumerate(labels):
+            tk.Label(dialog, text=label).grid(row=i, column=0, padx=10, pady=5, sticky=tk.W)
+            entry = tk.Entry(dialog, width=25)
+            entry.grid(row=i, column=1, padx=10, pady=5)
+            fields[label] = entry
+
+        def save():
+            try:
+                name = fields["Название:"].get().strip()
+                alcohol = float(fields["Крепость (%):"].get())
+                volume = float(fields["Объем единицы (мл):"].get())
+                quantity = int(fields["Количество:"].get())
+                price = float(fields["Цена за ед. (руб.):"].get())
+
+                if not name:
+                    messagebox.showerror("Ошибка", "Введите название")
+                    return
+
+                ing = Ingredient(None, name, alcohol, volume, quantity, price)
+                with self._db_lock:
+                    self.db.add_ingredient(ing)
+                self.refresh_ingredients()
+                dialog.destroy()
+                messagebox.showinfo("Успех", "Ингредиент добавлен")
+            except ValueError:
+                messagebox.showerror("Ошибка", "Проверьте правильность ввода чисел")
+            except Exception as e:
+                messagebox.showerror("Ошибка", str(e))
+
+        tk.Button(dialog, text="Сохранить", command=save, bg="#27ae60", fg="white").grid(row=5, column=0, columnspan=2, pady=20)
+
+    def restock_dialog(self):
+        ingredients = self._get_ingredients_cached()
+        if not ingredients:
+            messagebox.showwarning("Предупреждение", "Нет ингредиентов")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Пополнить запас")
+        dialog.geometry("350x200")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Ингредиент:").grid(row=0, column=0, padx=10, pady=5, sticky=tk.W)
+        ing_var = tk.StringVar()
+        ing_combo = ttk.Combobox(dialog, textvariable=ing_var, values=[f"{i.id}: {i.name}" for i in ingredients])
+        ing_combo.grid(row=0, column=1, padx=10, pady=5)
+
+        tk.Label(dialog, text="Количество:").grid(row=1, column=0, padx=10, pady=5, sticky=tk.W)
+        qty_entry = tk.Entry(dialog, width=10)
+        qty_entry.grid(row=1, column=1, padx=10, pady=5)
+
+        def restock():
+            try:
+                ing_id = int(ing_combo.get().split(":")[0])
+                quantity = int(qty_entry.get())
+                if quantity <= 0:
+                    messagebox.showerror("Ошибка", "Количество должно быть положительным")
+                    return
+                with self._db_lock:
+                    ok, msg = self.db.restock_ingredient(ing_id, quantity)
+                if ok:
+                    self.refresh_ingredients()
+                    dialog.destroy()
+                    messagebox.showinfo("Успех", msg)
+                else:
+                    messagebox.showerror("Ошибка", msg)
+            except ValueError:
+                messagebox.showerror("Ошибка", "Проверьте ввод")
+
+        tk.Button(dialog, text="Пополнить", command=restock, bg="#2980b9", fg="white").grid(row=2, column=0, columnspan=2, pady=20)
+
+    def refresh_cocktails(self):
+        self._cock_cache = None
+        self._submit_db(
+            lambda: (self.db.get_all_cocktails(), self.db.get_cocktails_availability()),
+            self._populate_cocktails)
+
+    def _populate_cocktails(self, result):
+        cocktails, availability = result
+        children = self.cock_tree.get_children()
+        if children:
+            self.cock_tree.delete(*children)
+
+        rows = []
+        for c in cocktails:
+            available = availability.get(c['id'], False)
+            recipe_str = ", ".join([f"{name}: {vol}мл" for name, vol in c['recipe'].items()])
+
+            rows.append((
+                c['id'], c['name'], f"{c['alcohol_percent']}%", f"{c['volume']}мл",
+                f"{c['price']} руб.", recipe_str[:50] + "..." if len(recipe_str) > 50 else recipe_str,
+                "✅" if available else "❌"
+            ))
+        for values in rows:
+            self.cock_tree.insert("", tk.END, values=values)
+
+    def add_cocktail_dialog(self):
+        ingredients = self._get_ingredients_cached()
+        if not ingredients:
+            messagebox.showwarning("Предупреждение", "Сначала добавьте ингредиенты")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Добавить коктейль")
+        dialog.geometry("500x400")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Название:").grid(row=0, column=0, padx=10, pady=5, sticky=tk.W)
+        name_entry = tk.Entry(dialog, width=30)
+        name_entry.grid(row=0, column=1, padx=10, pady=5)
+
+        tk.Label(dialog, text="Цена (руб.):").grid(row=1, column=0, padx=10, pady=5, sticky=tk.W)
+        price_entry = tk.Entry(dialog, width=30)
+        price_entry.grid(row=1, column=1, padx=10, pady=5)
+
+        tk.Label(dialog, text="Рецепт:", font=("Arial", 10, "bold")).grid(row=2, column=0, columnspan=2, pady=10)
+
+        recipe_vars = {}
+        for i, ing in enumerate(ingredients, start=3):
+            tk.Label(dialog, text=f"{ing.name} ({ing.volume_ml}мл):").grid(row=i, column=0, padx=10, pady=2, sticky=tk.W)
+            entry = tk.Entry(dialog, width=10)
+            entry.grid(row=i, column=1, padx=10, pady=2, sticky=tk.W)
+            recipe_vars[ing.id] = entry
+
+        def save():
+            try:
+                name = name_entry.get().strip()
+                price = float(price_entry.get())
+
+                recipe = {}
+                for ing_id, entry in recipe_vars.items():
+                    vol = entry.get().strip()
+                    if vol:
+                        recipe[ing_id] = float(vol)
+
+                if not name or not recipe:
+                    messagebox.showerror("Ошибка", "Заполните название и рецепт")
+                    return
+
+                with self._db_lock:
+                    self.db.add_cocktail(name, price, recipe)
+                self.refresh_cocktails()
+                dialog.destroy()
+                messagebox.showinfo("Успех", "Коктейль добавлен")
+            except ValueError:
+                messagebox.showerror("Ошибка", "Проверьте ввод чисел")
+            except Exception as e:
+                messagebox.showerror("Ошибка", str(e))
+
+        tk.Button(dialog, text="Сохранить", command=save, bg="#27ae60", fg="white").grid(row=len(ingredients)+3, column=0, columnspan=2, pady=20)
+
+    def sell_cocktail_dialog(self):
+        cocktails = self._get_cocktails_cached()
+        if not cocktails:
+            messagebox.showwarning("Предупреждение", "Нет коктейлей")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Продажа коктейля")
+        dialog.geometry("400x200")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Коктейль:").pack(pady=10)
+        cocktail_var = tk.StringVar()
+        cocktail_combo = ttk.Combobox(dialog, textvariable=cocktail_var, values=[f"{c['id']}: {c['name']} ({c['price']} руб.)" for c in cocktails])
+        cocktail_combo.pack(pady=5)
+
+        def sell():
+            try:
+                cocktail_id = int(cocktail_combo.get().split(":")[0])
+                with self._db_lock:
+                    ok, msg = self.db.sell_cocktail(cocktail_id)
+                if ok:
+                    self.refresh_ingredients()
+                    self.refresh_cocktails()
+                    self.refresh_sales()
+                    messagebox.showinfo("Успех", msg)
+                else:
+                    messagebox.showerror("Ошибка", msg)
+                dialog.destroy()
+            except ValueError:
+                messagebox.showerror("Ошибка", "Выберите коктейль")
+
+        tk.Button(dialog, text="Продать", command=sell, bg="#e67e22", fg="white").pack(pady=20)
+
+    def sell_ingredient_dialog(self):
+        ingredients = self._get_ingredients_cached()
+        if not ingredients:
+            messagebox.showwarning("Предупреждение", "Нет ингредиентов")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Продажа ингредиента")
+        dialog.geometry("400x250")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Ингредиент:").pack(pady=10)
+        ing_var = tk.StringVar()
+        ing_combo = ttk.Combobox(dialog, textvariable=ing_var, values=[f"{i.id}: {i.name} ({i.price_per_unit} руб./ед.)" for i in ingredients])
+        ing_combo.pack(pady=5)
+
+        tk.Label(dialog, text="Количество:").pack(pady=10)
+        qty_entry = tk.Entry(dialog, width=10)
+        qty_entry.pack(pady=5)
+
+        def sell():
+            try:
+                ing_id = int(ing_combo.get().split(":")[0])
+                quantity = int(qty_entry.get())
+                if quantity <= 0:
+                    messagebox.showerror("Ошибка", "Количество должно быть положительным")
+                    return
+                with self._db_lock:
+                    ok, msg = self.db.sell_ingredient(ing_id, quantity)
+                if ok:
+                    self.refresh_ingredients()
+                    self.refresh_sales()
+                    messagebox.showinfo("Успех", msg)
+                else:
+                    messagebox.showerror("Ошибка", msg)
+                dialog.destroy()
+            except ValueError:
+                messagebox.showerror("Ошибка", "Проверьте ввод")
+
+        tk.Button(dialog, text="Продать", command=sell, bg="#e67e22", fg="white").pack(pady=20)
+
+    def refresh_sales(self):
+        self._submit_db(lambda: self.db.get_sales_report(), self._populate_sales)
+
+    def _populate_sales(self, sales):
+        children = self.sales_tree.get_children()
+        if children:
+            self.sales_tree.delete(*children)
+
+        rows = []
+        for sale in sales:
+            if sale['item_type'] == 'cocktail':
+                name = sale['item_name'] or f"Коктейль ID {sale['item_id']}"
+            else:
+                name = sale['item_name'] or f"Ингредиент ID {sale['item_id']}"
+
+            rows.append((
+                sale['id'],
+                " Коктейль" if sale['item_type'] == 'cocktail' else " Ингредиент",
+                name,
+                sale['quantity'],
+                f"{sale['total_price']} руб.",
+                sale['date']
+            ))
+        for values in rows:
+            self.sales_tree.insert("", tk.END, values=values)
+
+    def show_sales_report(self):
+        self.report_text.delete(1.0, tk.END)
+
+        with self._db_lock:
+            sales = self.db.get_sales_report()
+        total = 0
+
+        parts = ["=" * 70 + "\n",
+                 " " * 25 + "ОТЧЕТ О ПРОДАЖАХ\n",
+                 "=" * 70 + "\n\n"]
+
+        for sale in sales:
+            if sale['item_type'] == 'cocktail':
+                name = sale['item_name'] or f"Коктейль ID {sale['item_id']}"
+                parts.append(f"{sale['date']} |  {name} | {sale['quantity']} шт. | {sale['total_price']} руб.\n")
+            else:
+                name = sale['item_name'] or f"Ингредиент ID {sale['item_id']}"
+                parts.append(f"{sale['date']} |  {name} | {sale['quantity']} ед. | {sale['total_price']} руб.\n")
+            total += sale['total_price']
+
+        parts.append("\n" + "=" * 70 + "\n")
+        parts.append(f"ИТОГО: {total} руб.\n")
+        parts.append("=" * 70 + "\n")
+
+        self.report_text.insert(1.0, "".join(parts))
+
+    def show_stock_report(self):
+        self.report_text.delete(1.0, tk.END)
+
+        with self._db_lock:
+            ingredients = self.db.get_ingredients_with_value()
+            cocktails = self.db.get_all_cocktails()
+            availability = self.db.get_cocktails_availability()
+
+        parts = ["=" * 70 + "\n",
+                 " " * 25 + "ОСТАТКИ НА СКЛАДЕ\n",
+                 "=" * 70 + "\n\n"]
+
+        parts.append(" ИНГРЕДИЕНТЫ:\n")
+        parts.append("-" * 50 + "\n")
+        for ing in ingredients:
+            parts.append(f"{ing['name']}: {ing['quantity']} ед. ({ing['total_volume']}мл) - {ing['stock_value']} руб.\n")
+
+        parts.append("\n КОКТЕЙЛИ (доступность):\n")
+        parts.append("-" * 50 + "\n")
+        for c in cocktails:
+            status = "✅" if availability.get(c['id'], False) else "❌"
+            parts.append(f"{status} {c['name']}: {c['price']} руб., {c['alcohol_percent']}%\n")
+
+        self.report_text.insert(1.0, "".join(parts))
+
+def main():
+    root = tk.Tk()
+    app = DrinkApp(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+
+    main()
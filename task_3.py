@@ -1,305 +1,388 @@
-import sqlite3
-import urllib.request
-import json
-
-
-class DatabaseManager:
-
-    def __init__(self, db_name="currency.db"):
-        self.db_name = db_name
-        self._create_tables()
-
-    def _get_connection(self):
-        return sqlite3.connect(self.db_name)
-
-    def _create_tables(self):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-                       CREATE TABLE IF NOT EXISTS groups
-                       (
-                           id
-                           INTEGER
-                           PRIMARY
-                           KEY
-                           AUTOINCREMENT,
-                           name
-                           TEXT
-                           UNIQUE
-                           NOT
-                           NULL
-                       )
-                       ''')
-
-        cursor.execute('''
-                       CREATE TABLE IF NOT EXISTS group_items
-                       (
-                           group_id
-                           INTEGER,
-                           currency_code
-                           TEXT,
-                           FOREIGN
-                           KEY
-                       (
-                           group_id
-                       ) REFERENCES groups
-                       (
-                           id
-                       )
-                           )
-                       ''')
-
-        conn.commit()
-        conn.close()
-
-
-    def add_group(self, name):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute('INSERT INTO groups (name) VALUES (?)', (name,))
-            conn.commit()
-            return True
-        except:
-            return False
-        finally:
-            conn.close()
-
-    def get_groups(self):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT name FROM groups ORDER BY name')
-        groups = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return groups
-
-    def delete_group(self, name):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT id FROM groups WHERE name = ?', (name,))
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return False
-
-        group_id = result[0]
-
-        cursor.execute('DELETE FROM group_items WHERE group_id = ?', (group_id,))
-        cursor.execute('DELETE FROM groups WHERE id = ?', (group_id,))
-
-        conn.commit()
-        conn.close()
-        return True
-
-    def add_currency(self, group_name, currency):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT id FROM groups WHERE name = ?', (group_name,))
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return False
-
-        group_id = result[0]
-
-        cursor.execute('INSERT INTO group_items (group_id, currency_code) VALUES (?, ?)',
-                       (group_id, currency.upper()))
-        conn.commit()
-        conn.close()
-        return True
-
-    def remove_currency(self, group_name, currency):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT id FROM groups WHERE name = ?', (group_name,))
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return False
-
-        group_id = result[0]
-
-        cursor.execute('DELETE FROM group_items WHERE group_id = ? AND currency_code = ?',
-                       (group_id, currency.upper()))
-        conn.commit()
-        conn.close()
-        return cursor.rowcount > 0
-
-    def get_group_currencies(self, group_name):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT id FROM groups WHERE name = ?', (group_name,))
-        result = cursor.fetchone()
-        if not result:
-            conn.close()
-            return []
-
-        group_id = result[0]
-
-        cursor.execute('SELECT currency_code FROM group_items WHERE group_id = ? ORDER BY currency_code',
-                       (group_id,))
-        currencies = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return currencies
-
-
-class SimpleCurrencyApp:
-
-    def __init__(self):
-        self.url = "https://www.cbr-xml-daily.ru/daily_json.js"
-        self.data = None
-        self.db = DatabaseManager()
-
-    def load_data(self):
-        try:
-            with urllib.request.urlopen(self.url) as response:
-                self.data = json.loads(response.read().decode('utf-8'))
-                return True
-        except:
-            print("Ошибка загрузки. Проверьте интернет.")
-            return False
-
-    def show_all(self):
-        if not self.data and not self.load_data():
-            return
-
-        print("\n" + "=" * 60)
-        print("ВСЕ ВАЛЮТЫ")
-        print("=" * 60)
-        print(f"{'Код':<6} {'Название':<35} {'Курс':<10}")
-        print("-" * 60)
-
-        print(f"{'RUB':<6} {'Российский рубль':<35} {'1.0000':<10}")
-
-        for code, info in sorted(self.data['Valute'].items()):
-            name = info.get('Name', '')[:35]
-            value = info.get('Value', 0)
-            print(f"{code:<6} {name:<35} {value:<10.4f}")
-
-    def show_one(self, code):
-        if not self.data and not self.load_data():
-            return
-
-        code = code.upper()
-
-        if code == "RUB":
-            print(f"\n{RUB} - Российский рубль: 1.0000")
-            return
-
-        if code not in self.data['Valute']:
-            print(f"Валюта {code} не найдена")
-            return
-
-        curr = self.data['Valute'][code]
-        print(f"\n{code} - {curr['Name']}")
-        print(f"Курс: {curr['Value']:.4f}")
-        print(f"Номинал: {curr['Nominal']}")
-
-        change = curr['Value'] - curr['Previous']
-        if change > 0:
-            print(f"Изменение: +{change:.4f} ↑")
-        elif change < 0:
-            print(f"Изменение: {change:.4f} ↓")
-
-    def run(self):
-        print("=" * 50)
-        print("МОНИТОРИНГ ВАЛЮТ")
-        print("=" * 50)
-
-        self.load_data()
-
-        while True:
-            print("\nМЕНЮ:")
-            print("1. Все валюты")
-            print("2. Найти валюту")
-            print("3. Создать группу")
-            print("4. Мои группы")
-            print("5. Добавить в группу")
-            print("6. Удалить из группы")
-            print("7. Показать группу")
-            print("8. Удалить группу")
-            print("0. Выход")
-
-            choice = input("\nВыберите: ").strip()
-
-            if choice == "0":
-                print("До свидания!")
-                break
-
-            elif choice == "1":
-                self.show_all()
-
-            elif choice == "2":
-                code = input("Код валюты (USD, EUR...): ").strip().upper()
-                self.show_one(code)
-
-            elif choice == "3":
-                name = input("Название группы: ").strip()
-                if self.db.add_group(name):
-                    print(f"Группа '{name}' создана")
-                else:
-                    print("Такая группа уже есть")
-
-            elif choice == "4":
-                groups = self.db.get_groups()
-                if groups:
-                    print("\nВаши группы:")
-                    for g in groups:
-                        print(f"  • {g}")
-                else:
-                    print("Нет групп")
-
-            elif choice == "5":
-                group = input("Группа: ").strip()
-                code = input("Код валюты: ").strip().upper()
-                if self.db.add_currency(group, code):
-                    print(f"{code} добавлен в {group}")
-                else:
-                    print("Ошибка")
-
-            elif choice == "6":
-                group = input("Группа: ").strip()
-                code = input("Код валюты: ").strip().upper()
-                if self.db.remove_currency(group, code):
-                    print(f"{code} удален из {group}")
-                else:
-                    print("Не найдено")
-
-            elif choice == "7":
-                group = input("Группа: ").strip()
-                currencies = self.db.get_group_currencies(group)
-                if currencies:
-                    print(f"\n{group}:")
-                    for code in currencies:
-                        if self.data and code in self.data.get('Valute', {}):
-                            rate = self.data['Valute'][code]['Value']
-                            print(f"  {code}: {rate:.4f}")
-                        else:
-                            print(f"  {code}")
-                else:
-                    print("Группа пуста или не существует")
-
-            elif choice == "8":
-                group = input("Группа для удаления: ").strip()
-                confirm = input(f"Удалить '{group}'? (да/нет): ").lower()
-                if confirm in ['да', 'yes', 'y', 'д']:
-                    if self.db.delete_group(group):
-                        print("Группа удалена")
-                    else:
-                        print("Группа не найдена")
-
-            input("\nНажмите Enter...")
-
-
-def main():
-    app = SimpleCurrencyApp()
-    app.run()
-
-
-if __name__ == "__main__":
+import gzip
+import http.client
+import sqlite3
+import sys
+import threading
+import time
+import json
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+class DatabaseManager:
+
+    # SQL-константы класса: один и тот же текст запроса в каждом вызове
+    _SQL_ADD_GROUP = 'INSERT OR IGNORE INTO groups (name) VALUES (?)'
+    _SQL_GET_GROUPS = 'SELECT name FROM groups ORDER BY name'
+    _SQL_DELETE_GROUP = 'DELETE FROM groups WHERE name = ?'
+    _SQL_CLEAR_GROUP = '''
+        DELETE FROM group_items
+        WHERE group_id IN (SELECT id FROM groups WHERE name = ?)
+    '''
+    _SQL_ADD_ITEM = '''
+        INSERT INTO group_items (group_id, currency_code)
+        SELECT id, ? FROM groups WHERE name = ?
+    '''
+    _SQL_REMOVE_ITEM = '''
+        DELETE FROM group_items
+        WHERE group_id IN (SELECT id FROM groups WHERE name = ?)
+          AND currency_code = ?
+    '''
+    _SQL_GET_ITEMS = '''
+        SELECT gi.currency_code
+        FROM group_items gi
+        JOIN groups g ON g.id = gi.group_id
+        WHERE g.name = ?
+        ORDER BY gi.currency_code
+    '''
+
+    # Базы, где схема уже создана в этом процессе — DDL второй раз не гоняем
+    _SCHEMA_READY = set()
+
+    def __init__(self, db_name="currency.db"):
+        self.db_name = db_name
+        # Одно постоянное соединение вместо connect/close в каждом методе
+        self.conn = sqlite3.connect(db_name, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-8000")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.cursor = self.conn.cursor()
+        self._create_tables()
+        # Отдельное read-only соединение: чтения со своим кэшем страниц,
+        # в WAL-режиме не блокируются записями
+        self._reader = sqlite3.connect(f'file:{db_name}?mode=ro', uri=True,
+                                       check_same_thread=False)
+        self._reader.execute("PRAGMA query_only=1")
+        # Курсор для одноколоночных выборок: сразу отдаёт значения
+        self._scalar_cursor = self._reader.cursor()
+        self._scalar_cursor.row_factory = lambda cur, row: row[0]
+
+    def close(self):
+        self._reader.close()
+        self.conn.close()
+
+    def _create_tables(self):
+        if self.db_name in DatabaseManager._SCHEMA_READY:
+            return
+
+        cursor = self.cursor
+
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS groups
+                       (
+                           id INTEGER PRIMARY KEY AUTOINCREMENT,
+                           name TEXT UNIQUE NOT NULL
+                       )
+                       ''')
+
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS group_items
+                       (
+                           group_id INTEGER,
+                           currency_code TEXT,
+                           FOREIGN KEY (group_id) REFERENCES groups (id) ON DELETE CASCADE
+                       )
+                       ''')
+
+        # Покрывающий индекс: выборка валют группы идёт прямо из индекса, без сортировки
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_group ON group_items(group_id, currency_code)')
+        DatabaseManager._SCHEMA_READY.add(self.db_name)
+
+    def add_group(self, name):
+        # OR IGNORE: дубликат виден по rowcount, без исключения
+        self.cursor.execute(self._SQL_ADD_GROUP, (name,))
+        return self.cursor.rowcount == 1
+
+    def get_groups(self):
+        return self._scalar_cursor.execute(self._SQL_GET_GROUPS).fetchall()
+
+    def delete_group(self, name):
+        # Чистим записи явно: в базах, созданных до ON DELETE CASCADE,
+        # старый внешний ключ без каскада остаётся навсегда
+        self.cursor.execute('BEGIN')
+        try:
+            self.cursor.execute(self._SQL_CLEAR_GROUP, (name,))
+            self.cursor.execute(self._SQL_DELETE_GROUP, (name,))
+            deleted = self.cursor.rowcount
+            self.cursor.execute('COMMIT')
+        except Exception:
+            self.cursor.execute('ROLLBACK')
+            raise
+        return deleted > 0
+
+    def add_currency(self, group_name, currency):
+        self.cursor.execute(self._SQL_ADD_ITEM, (currency.upper(), group_name))
+        return self.cursor.rowcount > 0
+
+    def add_currencies(self, group_name, currencies):
+        # Вся пачка кодов — одна транзакция, один fsync
+        self.cursor.execute('BEGIN')
+        try:
+            self.cursor.executemany(self._SQL_ADD_ITEM,
+                                    [(c.upper(), group_name) for c in currencies])
+            added = self.cursor.rowcount
+            self.cursor.execute('COMMIT')
+        except Exception:
+            self.cursor.execute('ROLLBACK')
+            raise
+        return added > 0
+
+    def remove_currency(self, group_name, currency):
+        self.cursor.execute(self._SQL_REMOVE_ITEM, (group_name, currency.upper()))
+        return self.cursor.rowcount > 0
+
+    def get_group_currencies(self, group_name):
+        return self._scalar_cursor.execute(self._SQL_GET_ITEMS, (group_name,)).fetchall()
+
+
+class SimpleCurrencyApp:
+
+    def __init__(self):
+        self.host = "www.cbr-xml-daily.ru"
+        self.path = "/daily_json.js"
+        self.data = None
+        # Постоянное keep-alive соединение: без нового TCP/TLS на каждый запрос
+        self._http = None
+        self._etag = None
+        self._last_modified = None
+        self._net_lock = threading.Lock()
+        # Диспетчеризация меню по словарю вместо цепочки elif
+        self._menu = {
+            "0": self._do_quit,
+            "1": self.show_all,
+            "2": self._do_find,
+            "3": self._do_create_group,
+            "4": self._do_list_groups,
+            "5": self._do_add_currencies,
+            "6": self._do_remove_currency,
+            "7": self._do_show_group,
+            "8": self._do_delete_group,
+        }
+        # Индекс по коду и отсортированный список строятся один раз за загрузку
+        self._valute = {}
+        self._valute_sorted = []
+        # Курсы кэшируются на TTL: повторные запросы меню не ходят в сеть
+        self._ttl = 600
+        self._fetched_at = 0.0
+        self.db = DatabaseManager()
+
+    def _request(self):
+        if self._http is None:
+            self._http = http.client.HTTPSConnection(self.host, timeout=5)
+        headers = {'Accept-Encoding': 'gzip'}
+        if self._etag:
+            headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            headers['If-Modified-Since'] = self._last_modified
+        self._http.request('GET', self.path, headers=headers)
+        return self._http.getresponse()
+
+    def load_data(self, quiet=False):
+        # Лок на случай одновременного вызова из меню и фонового обновления
+        with self._net_lock:
+            return self._load_data_locked(quiet)
+
+    def _load_data_locked(self, quiet):
+        try:
+            try:
+                response = self._request()
+            except (http.client.HTTPException, OSError):
+                # Сервер закрыл keep-alive — переподключаемся один раз
+                self._http.close()
+                self._http = None
+                response = self._request()
+
+            body = response.read()
+            if response.status == 304:
+                # Данные не менялись — старый разбор остаётся актуальным
+                self._fetched_at = time.monotonic()
+                return True
+
+            self._etag = response.getheader('ETag')
+            self._last_modified = response.getheader('Last-Modified')
+            if response.getheader('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            self.data = _json_loads(body)
+            self._valute = self.data.get('Valute', {})
+            self._valute_sorted = sorted(self._valute.items())
+            self._fetched_at = time.monotonic()
+            return True
+        except (http.client.HTTPException, OSError, ValueError):
+            # ValueError покрывает и JSONDecodeError; Ctrl-C не глотаем
+            if not quiet:
+                print("Ошибка загрузки. Проверьте интернет.")
+            return False
+
+    def _ensure_data(self):
+        if self.data and time.monotonic() - self._fetched_at <= self._ttl:
+            return True
+        return self.load_data() or self.data is not None
+
+    def show_all(self):
+        if not self._ensure_data():
+            return
+
+        # Один вывод вместо print на каждую валюту
+        row_fmt = "{:<6} {:<35} {:<10.4f}".format
+        lines = ["",
+                 "=" * 60,
+                 "ВСЕ ВАЛЮТЫ",
+                 "=" * 60,
+                 f"{'Код':<6} {'Название':<35} {'Курс':<10}",
+                 "-" * 60,
+                 f"{'RUB':<6} {'Российский рубль':<35} {'1.0000':<10}"]
+
+        for code, info in self._valute_sorted:
+            lines.append(row_fmt(code, info.get('Name', '')[:35], info.get('Value', 0)))
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def show_one(self, code):
+        if not self._ensure_data():
+            return
+
+        code = code.upper()
+
+        if code == "RUB":
+            print("\nRUB - Российский рубль: 1.0000")
+            return
+
+        curr = self._valute.get(code)
+        if curr is None:
+            print(f"Валюта {code} не найдена")
+            return
+
+        value = curr['Value']
+        change = value - curr['Previous']
+        print(f"\n{code} - {curr['Name']}")
+        print(f"Курс: {value:.4f}")
+        print(f"Номинал: {curr['Nominal']}")
+
+        if change > 0:
+            print(f"Изменение: +{change:.4f} ↑")
+        elif change < 0:
+            print(f"Изменение: {change:.4f} ↓")
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self._ttl)
+            self.load_data(quiet=True)
+
+    def _do_find(self):
+        code = input("Код валюты (USD, EUR...): ").strip().upper()
+        self.show_one(code)
+
+    def _do_create_group(self):
+        name = input("Название группы: ").strip()
+        if self.db.add_group(name):
+            print(f"Группа '{name}' создана")
+        else:
+            print("Такая группа уже есть")
+
+    def _do_list_groups(self):
+        groups = self.db.get_groups()
+        if groups:
+            print("\nВаши группы:")
+            for g in groups:
+                print(f"  • {g}")
+        else:
+            print("Нет групп")
+
+    def _do_add_currencies(self):
+        group = input("Группа: ").strip()
+        codes = [c.strip().upper() for c in input("Коды валют (через запятую): ").split(",") if c.strip()]
+        if codes and self.db.add_currencies(group, codes):
+            print(f"{', '.join(codes)} добавлен(ы) в {group}")
+        else:
+            print("Ошибка")
+
+    def _do_remove_currency(self):
+        group = input("Группа: ").strip()
+        code = input("Код валюты: ").strip().upper()
+        if self.db.remove_currency(group, code):
+            print(f"{code} удален из {group}")
+        else:
+            print("Не найдено")
+
+    def _do_show_group(self):
+        group = input("Группа: ").strip()
+        currencies = self.db.get_group_currencies(group)
+        if currencies:
+            self._ensure_data()
+            print(f"\n{group}:")
+            for code in currencies:
+                if code in self._valute:
+                    rate = self._valute[code]['Value']
+                    print(f"  {code}: {rate:.4f}")
+                else:
+                    print(f"  {code}")
+        else:
+            print("Группа пуста или не существует")
+
+    def _do_delete_group(self):
+        group = input("Группа для удаления: ").strip()
+        confirm = input(f"Удалить '{group}'? (да/нет): ").lower()
+        if confirm in ['да', 'yes', 'y', 'д']:
+            if self.db.delete_group(group):
+                print("Группа удалена")
+            else:
+                print("Группа не найдена")
+
+    def _prefetch_if_stale(self):
+        # Пока пользователь читает вывод, успеваем обновить курсы в фоне
+        if not self.data or time.monotonic() - self._fetched_at > self._ttl:
+            threading.Thread(target=self.load_data, kwargs={'quiet': True},
+                             daemon=True).start()
+
+    def _do_quit(self):
+        self._running = False
+        self.db.close()
+        print("До свидания!")
+
+    def run(self):
+        print("=" * 50)
+        print("МОНИТОРИНГ ВАЛЮТ")
+        print("=" * 50)
+
+        self.load_data()
+        # Фоновое обновление курсов: меню не ждёт сеть после истечения TTL
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+
+        self._running = True
+        while self._running:
+            print("\nМЕНЮ:")
+            print("1. Все валюты")
+            print("2. Найти валюту")
+            print("3. Создать группу")
+            print("4. Мои группы")
+            print("5. Добавить в группу")
+            print("6. Удалить из группы")
+            print("7. Показать группу")
+            print("8. Удалить группу")
+            print("0. Выход")
+
+            choice = input("\nВыберите: ").strip()
+
+            handler = self._menu.get(choice)
+            if handler:
+                handler()
+            if not self._running:
+                break
+
+            self._prefetch_if_stale()
+            input("\nНажмите Enter...")
+
+
+def main():
+    app = SimpleCurrencyApp()
+    app.run()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file